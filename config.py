@@ -1,16 +1,20 @@
 """Configuration management for traceability engine."""
 
+import functools
 import os
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 from dotenv import load_dotenv
 
-# Load .env file from current directory
-load_dotenv()
+# Load .env file from current directory, unless the environment is
+# already configured (skips the filesystem scan on re-imports)
+if "GROQ_API_KEY" not in os.environ:
+    load_dotenv()
 
 
-@dataclass
+@dataclass(slots=True)
 class GroqConfig:
     """Configuration for Groq LLM."""
     api_key: str
@@ -19,64 +23,81 @@ class GroqConfig:
     max_tokens: int = 2000
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingConfig:
     """Configuration for embedding model."""
     model_name: str = "all-MiniLM-L6-v2"
     normalize: bool = True
 
 
-@dataclass
+# Shared read-only defaults for LinkingConfig; MappingProxyType keeps them
+# immutable so every instance can alias the same mapping instead of
+# allocating fresh dicts per construction. Callers needing a mutable copy
+# should use dict(config.linking.weights).
+
+# Scoring weights - balanced approach emphasizing multiple signals
+_WEIGHTS = MappingProxyType({
+    'embedding': 0.35,   # Semantic similarity - reduced, not sole decision maker
+    'keyword': 0.35,     # Keyword overlap - increased, strong indicator
+    'quantity': 0.15,    # Numerical values
+    'name': 0.15         # Variable names
+})
+
+# Hierarchical linking - more lenient thresholds to improve coverage
+_LAYER_THRESHOLDS = MappingProxyType({
+    'SYSTEM_REQ_DECOMPOSED->HLR': 0.28,  # Lower - catch more HLR links
+    'HLR->LLR': 0.25,                     # Lower - catch more LLR links
+    'LLR->CODE_VAR': 0.23                 # Lower - catch more variable links
+})
+
+# Quality filters - balanced validation (catch genuine links, prevent noise)
+_QUALITY_FILTERS = MappingProxyType({
+    'min_text_overlap': 0.05,        # Lower baseline (was 0.08)
+    'min_combined_signals': 2,        # Still require 2 signals for corroboration
+    'require_id_or_keyword': False,   # Real-world compatible
+    'max_links_per_source': 15,       # Allow more links (was 10)
+})
+
+# Confidence bands - for reporting
+_CONFIDENCE_BANDS = MappingProxyType({
+    'high': 0.60,      # Lowered (was 0.65)
+    'medium': 0.40,    # Lowered (was 0.45)
+    'low': 0.25        # Lowered (was 0.30)
+})
+
+
+@dataclass(slots=True)
 class LinkingConfig:
     """Configuration for linking algorithm with quality controls."""
-    
+
     # Base thresholds - more lenient to catch more genuine links
     embedding_threshold: float = 0.10  # Lower to allow more candidates
     confidence_threshold: float = 0.25  # Lower baseline - quality filters validate
     top_k_candidates: int = 20  # Consider more candidates
-    
-    # Scoring weights - balanced approach emphasizing multiple signals
-    weights: dict = field(default_factory=lambda: {
-        'embedding': 0.35,   # Semantic similarity - reduced, not sole decision maker
-        'keyword': 0.35,     # Keyword overlap - increased, strong indicator
-        'quantity': 0.15,    # Numerical values
-        'name': 0.15         # Variable names
-    })
-    
-    # Hierarchical linking - more lenient thresholds to improve coverage
-    layer_thresholds: dict = field(default_factory=lambda: {
-        'SYSTEM_REQ_DECOMPOSED->HLR': 0.28,  # Lower - catch more HLR links
-        'HLR->LLR': 0.25,                     # Lower - catch more LLR links
-        'LLR->CODE_VAR': 0.23                 # Lower - catch more variable links
-    })
-    
-    # Quality filters - balanced validation (catch genuine links, prevent noise)
-    quality_filters: dict = field(default_factory=lambda: {
-        'min_text_overlap': 0.05,        # Lower baseline (was 0.08)
-        'min_combined_signals': 2,        # Still require 2 signals for corroboration
-        'require_id_or_keyword': False,   # Real-world compatible
-        'max_links_per_source': 15,       # Allow more links (was 10)
-    })
-    
-    # Confidence bands - for reporting
-    confidence_bands: dict = field(default_factory=lambda: {
-        'high': 0.60,      # Lowered (was 0.65)
-        'medium': 0.40,    # Lowered (was 0.45)
-        'low': 0.25        # Lowered (was 0.30)
-    })
+
+    # default_factory returns the shared proxy itself (no copy); dataclasses
+    # reject mappingproxy as a plain default because it is unhashable
+    weights: Mapping = field(default_factory=lambda: _WEIGHTS)
+    layer_thresholds: Mapping = field(default_factory=lambda: _LAYER_THRESHOLDS)
+    quality_filters: Mapping = field(default_factory=lambda: _QUALITY_FILTERS)
+    confidence_bands: Mapping = field(default_factory=lambda: _CONFIDENCE_BANDS)
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Main configuration."""
     data_dir: str = "./data"
+    # Caches must survive across runs, so they live outside data_dir
+    # (which main.py repoints at a fresh run_<timestamp> directory)
+    cache_dir: str = "./data/cache"
     groq: Optional[GroqConfig] = None
     embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
     linking: LinkingConfig = field(default_factory=LinkingConfig)
     
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def from_env(cls):
-        """Create config from environment variables."""
+        """Create config from environment variables (cached after first call)."""
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY environment variable not set")
@@ -10,8 +10,9 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
-from config import Config
-from src.pipeline.orchestrator import TraceabilityPipeline
+# Heavy imports (config/pipeline pull in the embedding and LLM stacks) are
+# deferred into main() so --help and argument/file errors exit in
+# milliseconds instead of paying multi-second import cost.
 
 
 def main():
@@ -167,10 +168,15 @@ Examples:
         print(f"   Variables:   (not provided)")
 
     
-    # Load configuration
+    # Load configuration (imports deferred until inputs are validated)
+    from config import Config
+    from src.pipeline.orchestrator import TraceabilityPipeline
+
     try:
         config = Config.from_env()
         config.data_dir = str(run_dir)
+        # Caches live under the base data dir so they persist across runs
+        config.cache_dir = str(base_data_dir / "cache")
     except ValueError as e:
         print(f"\n❌ Configuration error: {e}")
         print("\nPlease set GROQ_API_KEY environment variable:")
@@ -1,8 +1,8 @@
 """Trace graph analysis and gap detection."""
 
 from typing import Dict, List, Any, Set, Tuple
-from datetime import datetime
-from src.utils.id_utils import get_expected_parent_type, get_expected_child_type
+from collections import defaultdict
+from datetime import datetime, timezone
 
 
 # Expected trace chain depths
@@ -21,53 +21,93 @@ EXPECTED_TERMINAL_TYPE = {
     'LLR': 'CODE_VAR'
 }
 
+# Inlined hierarchy maps (mirroring id_utils.get_expected_parent_type /
+# get_expected_child_type) so the per-artifact orphan loop does a direct
+# dict lookup instead of a helper call that rebuilds its mapping
+_EXPECTED_PARENT = {
+    'SYSTEM_REQ_DECOMPOSED': 'SYSTEM_REQ',
+    'HLR': 'SYSTEM_REQ_DECOMPOSED',
+    'LLR': 'HLR',
+    'CODE_VAR': 'LLR'
+}
+
+_EXPECTED_CHILD = {
+    'SYSTEM_REQ': 'SYSTEM_REQ_DECOMPOSED',
+    'SYSTEM_REQ_DECOMPOSED': 'HLR',
+    'HLR': 'LLR',
+    'LLR': 'CODE_VAR'
+}
+
 
 def build_trace_graph(artifacts: Dict[str, Any], links: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Build in-memory graph structure from artifacts and links."""
     
-    graph = {
-        'nodes': artifacts,
-        'edges_down': {},  # parent_id -> [child_ids]
-        'edges_up': {}     # child_id -> [parent_ids]
-    }
-    
+    edges_down = defaultdict(list)  # parent_id -> [child_ids]
+    edges_up = defaultdict(list)    # child_id -> [parent_ids]
+
     # Build edges from links
     for link in links:
-        source_id = link['source_id']
-        target_id = link['target_id']
-        
-        # Forward edges (down)
-        if source_id not in graph['edges_down']:
-            graph['edges_down'][source_id] = []
-        graph['edges_down'][source_id].append(target_id)
-        
-        # Backward edges (up)
-        if target_id not in graph['edges_up']:
-            graph['edges_up'][target_id] = []
-        graph['edges_up'][target_id].append(source_id)
-    
-    return graph
+        edges_down[link['source_id']].append(link['target_id'])
+        edges_up[link['target_id']].append(link['source_id'])
 
+    # Freeze adjacency into plain dicts of tuples: read sites never insert
+    # keys on misses, and tuples are smaller and faster to iterate in the
+    # DFS hot loop than over-allocated lists
+    return {
+        'nodes': artifacts,
+        'edges_down': {k: tuple(v) for k, v in edges_down.items()},
+        'edges_up': {k: tuple(v) for k, v in edges_up.items()}
+    }
+
+
+def trace_chains_flat(graph: Dict[str, Any], start_id: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Find all complete trace chains from a starting node using DFS.
+
+    Chains are stored in a single flat node-id buffer with (start, end)
+    spans instead of one list per chain, avoiding a per-chain list
+    allocation; chain i is `flat[spans[i][0]:spans[i][1]]`.
+    """
+
+    flat = []
+    spans = []
+    edges_down = graph['edges_down']
+
+    # Iterative DFS with a single reusable path buffer; each stack entry
+    # records the depth at which its node sits so the buffer can be
+    # truncated instead of copied on every visit
+    stack = [(start_id, 0)]
+    path = []
+    while stack:
+        node_id, depth = stack.pop()
+        del path[depth:]
+        path.append(node_id)
+
+        # Drop children already on the current path: cyclic links would
+        # otherwise loop forever; the chain terminates at the cycle edge.
+        # Paths are at most a few nodes deep, so the membership scan is
+        # cheaper than maintaining a parallel set
+        children = [
+            child_id for child_id in edges_down.get(node_id, ())
+            if child_id not in path
+        ]
 
-def trace_chain_forward(graph: Dict[str, Any], start_id: str) -> List[List[str]]:
-    """Find all complete trace chains from a starting node using DFS."""
-    
-    chains = []
-    
-    def dfs(node_id: str, path: List[str]):
-        current_path = path + [node_id]
-        children = graph['edges_down'].get(node_id, [])
-        
         if not children:
-            # Leaf node - complete chain
-            chains.append(current_path)
+            # Leaf node (or cycle break) - complete chain
+            start = len(flat)
+            flat.extend(path)
+            spans.append((start, len(flat)))
         else:
             # Continue traversal
             for child_id in children:
-                dfs(child_id, current_path)
-    
-    dfs(start_id, [])
-    return chains
+                stack.append((child_id, depth + 1))
+
+    return flat, spans
+
+
+def trace_chain_forward(graph: Dict[str, Any], start_id: str) -> List[List[str]]:
+    """Find all complete trace chains from a starting node using DFS."""
+    flat, spans = trace_chains_flat(graph, start_id)
+    return [flat[s:e] for s, e in spans]
 
 
 def classify_chain(chain: List[str], graph: Dict[str, Any]) -> str:
@@ -80,8 +120,9 @@ def classify_chain(chain: List[str], graph: Dict[str, Any]) -> str:
     start_id = chain[0]
     terminal_id = chain[-1]
     
-    start_type = graph['nodes'][start_id]['type']
-    terminal_type = graph['nodes'][terminal_id]['type']
+    nodes = graph['nodes']
+    start_type = nodes[start_id]['type']
+    terminal_type = nodes[terminal_id]['type']
     
     expected_depth = EXPECTED_CHAIN_DEPTH.get(start_type, 1)
     expected_terminal = EXPECTED_TERMINAL_TYPE.get(start_type, 'CODE_VAR')
@@ -105,116 +146,200 @@ def classify_chain(chain: List[str], graph: Dict[str, Any]) -> str:
         return 'BROKEN'
 
 
-def compute_coverage_metrics(
-    graph: Dict[str, Any],
-    artifacts: Dict[str, Any]
-) -> Dict[str, Any]:
-    """Compute coverage metrics at each level."""
-    
-    metrics = {}
-    
-    # Group artifacts by type
+def classify_chains_for(
+    flat: List[str],
+    spans: List[Tuple[int, int]],
+    start_type: str,
+    nodes: Dict[str, Any]
+) -> List[str]:
+    """Classify all chains sharing one start type.
+
+    Takes the flat-buffer representation from `trace_chains_flat` and
+    hoists the per-chain start-node and EXPECTED_* lookups out of the
+    loop; all chains from one system requirement share them.
+    """
+    expected_depth = EXPECTED_CHAIN_DEPTH.get(start_type, 1)
+    expected_terminal = EXPECTED_TERMINAL_TYPE.get(start_type, 'CODE_VAR')
+
+    classifications = []
+    for start, end in spans:
+        actual_depth = end - start
+        if actual_depth >= expected_depth and nodes[flat[end - 1]]['type'] == expected_terminal:
+            classifications.append('COMPLETE')
+        elif 1 < actual_depth < expected_depth:
+            classifications.append('PARTIAL')
+        elif actual_depth == 1:
+            classifications.append('INCOMPLETE')
+        else:
+            classifications.append('BROKEN')
+    return classifications
+
+
+def bucket_artifacts_by_type(artifacts: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Group artifact ids by type in a single pass, preserving order."""
     by_type = {}
     for art_id, artifact in artifacts.items():
         art_type = artifact['type']
         if art_type not in by_type:
             by_type[art_type] = []
-        by_type[art_type].append(artifact)
-    
+        by_type[art_type].append(art_id)
+    return by_type
+
+
+def compute_coverage_metrics(
+    graph: Dict[str, Any],
+    artifacts: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """Compute coverage metrics at each level.
+
+    Returns (metrics, by_type) mapping each artifact type to its ids in
+    insertion order, so callers can reuse the buckets without
+    re-scanning the artifact population. Only ids are bucketed — the
+    full records stay in `artifacts`, keeping the working set small.
+    """
+
+    metrics = {}
+
+    # Group artifact ids by type in one pass
+    by_type = bucket_artifacts_by_type(artifacts)
+
+    # Id sets per type so linkage checks become set intersections
+    # against the edge maps instead of per-artifact list scans
+    ids_by_type = {t: set(ids) for t, ids in by_type.items()}
+    up_keys = graph['edges_up'].keys()
+    down_keys = graph['edges_down'].keys()
+
     # System Requirement Coverage
-    sys_reqs = by_type.get('SYSTEM_REQ', [])
-    sys_with_children = [s for s in sys_reqs if graph['edges_down'].get(s['id'], [])]
+    sys_ids = ids_by_type.get('SYSTEM_REQ', set())
+    sys_with_children = len(sys_ids & down_keys)
     metrics['system_req_coverage'] = {
-        'total': len(sys_reqs),
-        'with_decomposition': len(sys_with_children),
-        'percentage': (len(sys_with_children) / len(sys_reqs) * 100) if sys_reqs else 0.0
+        'total': len(sys_ids),
+        'with_decomposition': sys_with_children,
+        'percentage': (sys_with_children / len(sys_ids) * 100) if sys_ids else 0.0
     }
-    
+
     # Decomposed to HLR Coverage
-    decomposed = by_type.get('SYSTEM_REQ_DECOMPOSED', [])
-    decomposed_with_hlr = [d for d in decomposed if graph['edges_down'].get(d['id'], [])]
+    decomposed_ids = ids_by_type.get('SYSTEM_REQ_DECOMPOSED', set())
+    decomposed_with_hlr = len(decomposed_ids & down_keys)
     metrics['decomposed_to_hlr'] = {
-        'total': len(decomposed),
-        'with_hlr_link': len(decomposed_with_hlr),
-        'percentage': (len(decomposed_with_hlr) / len(decomposed) * 100) if decomposed else 0.0
+        'total': len(decomposed_ids),
+        'with_hlr_link': decomposed_with_hlr,
+        'percentage': (decomposed_with_hlr / len(decomposed_ids) * 100) if decomposed_ids else 0.0
     }
-    
-    # HLR Coverage
-    hlrs = by_type.get('HLR', [])
-    hlrs_with_parent = [h for h in hlrs if graph['edges_up'].get(h['id'], [])]
-    hlrs_with_child = [h for h in hlrs if graph['edges_down'].get(h['id'], [])]
-    hlrs_fully_linked = [h for h in hlrs if h in hlrs_with_parent and h in hlrs_with_child]
-    metrics['hlr_coverage'] = {
-        'total': len(hlrs),
-        'with_parent': len(hlrs_with_parent),
-        'with_children': len(hlrs_with_child),
-        'fully_linked': len(hlrs_fully_linked),
-        'parent_percentage': (len(hlrs_with_parent) / len(hlrs) * 100) if hlrs else 0.0,
-        'child_percentage': (len(hlrs_with_child) / len(hlrs) * 100) if hlrs else 0.0
-    }
-    
-    # LLR Coverage
-    llrs = by_type.get('LLR', [])
-    llrs_with_parent = [l for l in llrs if graph['edges_up'].get(l['id'], [])]
-    llrs_with_child = [l for l in llrs if graph['edges_down'].get(l['id'], [])]
-    llrs_fully_linked = [l for l in llrs if l in llrs_with_parent and l in llrs_with_child]
-    metrics['llr_coverage'] = {
-        'total': len(llrs),
-        'with_parent': len(llrs_with_parent),
-        'with_children': len(llrs_with_child),
-        'fully_linked': len(llrs_fully_linked),
-        'parent_percentage': (len(llrs_with_parent) / len(llrs) * 100) if llrs else 0.0,
-        'child_percentage': (len(llrs_with_child) / len(llrs) * 100) if llrs else 0.0
-    }
-    
+
+    # HLR / LLR Coverage — only counts are reported, so intersect once
+    # per direction and derive fully_linked from the two sets
+    for metric_key, type_name in (('hlr_coverage', 'HLR'), ('llr_coverage', 'LLR')):
+        type_ids = ids_by_type.get(type_name, set())
+        with_parent = type_ids & up_keys
+        with_child = type_ids & down_keys
+        n_parent = len(with_parent)
+        n_child = len(with_child)
+        metrics[metric_key] = {
+            'total': len(type_ids),
+            'with_parent': n_parent,
+            'with_children': n_child,
+            'fully_linked': len(with_parent & with_child),
+            'parent_percentage': (n_parent / len(type_ids) * 100) if type_ids else 0.0,
+            'child_percentage': (n_child / len(type_ids) * 100) if type_ids else 0.0
+        }
+
     # Variable Coverage
-    variables = by_type.get('CODE_VAR', [])
-    vars_with_parent = [v for v in variables if graph['edges_up'].get(v['id'], [])]
+    var_ids = ids_by_type.get('CODE_VAR', set())
+    vars_with_parent = len(var_ids & up_keys)
     metrics['variable_coverage'] = {
-        'total': len(variables),
-        'traced': len(vars_with_parent),
-        'orphaned': len(variables) - len(vars_with_parent),
-        'percentage': (len(vars_with_parent) / len(variables) * 100) if variables else 0.0
+        'total': len(var_ids),
+        'traced': vars_with_parent,
+        'orphaned': len(var_ids) - vars_with_parent,
+        'percentage': (vars_with_parent / len(var_ids) * 100) if var_ids else 0.0
     }
-    
-    return metrics
 
+    return metrics, by_type
+
+
+TYPES_REQUIRING_PARENT = frozenset({'HLR', 'LLR', 'CODE_VAR'})
+TYPES_REQUIRING_CHILDREN = frozenset({'SYSTEM_REQ', 'SYSTEM_REQ_DECOMPOSED', 'HLR', 'LLR'})
+
+
+def identify_gaps(
+    graph: Dict[str, Any],
+    artifacts: Dict[str, Any],
+    chains_by_sys_req: Dict[str, List[List[str]]] = None
+) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Identify orphaned artifacts and all traceability gaps in one pass.
+
+    `chains_by_sys_req` maps each SYSTEM_REQ id to its precomputed trace
+    chains; if omitted, chains are computed here.
+
+    Returns (orphans, gaps).
+    """
 
-def find_orphans(graph: Dict[str, Any], artifacts: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
-    """Identify orphaned artifacts."""
-    
     orphans = {
         'no_parent': [],
         'no_children': [],
         'isolated': []
     }
-    
-    TYPES_REQUIRING_PARENT = ['HLR', 'LLR', 'CODE_VAR']
-    TYPES_REQUIRING_CHILDREN = ['SYSTEM_REQ', 'SYSTEM_REQ_DECOMPOSED', 'HLR', 'LLR']
-    
+    gaps = []
+    gap_counter = 1
+
+    edges_up = graph['edges_up']
+    edges_down = graph['edges_down']
+
+    # Single pass over artifacts: classify orphans and emit the matching
+    # gap dicts from the same edge lookups
     for art_id, artifact in artifacts.items():
         art_type = artifact['type']
-        parents = graph['edges_up'].get(art_id, [])
-        children = graph['edges_down'].get(art_id, [])
-        
-        # Check for missing parent
+        parents = edges_up.get(art_id, ())
+        children = edges_down.get(art_id, ())
+
+        # Gap Type 1: Orphaned artifacts with no parent
         if art_type in TYPES_REQUIRING_PARENT and not parents:
             orphans['no_parent'].append({
                 'artifact_id': art_id,
                 'type': art_type,
-                'expected_parent_type': get_expected_parent_type(art_type),
+                'expected_parent_type': _EXPECTED_PARENT.get(art_type),
                 'reason': f"{art_type} has no parent link"
             })
-        
-        # Check for missing children
+            gaps.append({
+                'gap_id': f"GAP-{gap_counter:03d}",
+                'type': 'orphan_no_parent',
+                'severity': 'high',
+                'artifact_id': art_id,
+                'artifact_type': art_type,
+                'expected_parent_type': _EXPECTED_PARENT.get(art_type),
+                'description': f"{art_type} has no parent link",
+                'reason': f"{art_type} has no parent link"
+            })
+            gap_counter += 1
+
+        # Gap Type 2: Artifacts with no children (dead ends)
         if art_type in TYPES_REQUIRING_CHILDREN and not children:
             orphans['no_children'].append({
                 'artifact_id': art_id,
                 'type': art_type,
-                'expected_child_type': get_expected_child_type(art_type),
+                'expected_child_type': _EXPECTED_CHILD.get(art_type),
                 'reason': f"{art_type} has no child links"
             })
-        
+
+            # Determine severity based on type
+            severity = 'medium'
+            if art_type in ('SYSTEM_REQ', 'SYSTEM_REQ_DECOMPOSED'):
+                severity = 'critical'
+            elif art_type == 'HLR':
+                severity = 'high'
+
+            gaps.append({
+                'gap_id': f"GAP-{gap_counter:03d}",
+                'type': 'orphan_no_children',
+                'severity': severity,
+                'artifact_id': art_id,
+                'artifact_type': art_type,
+                'expected_child_type': _EXPECTED_CHILD.get(art_type),
+                'description': f"{art_type} has no child links",
+                'reason': f"{art_type} has no child links"
+            })
+            gap_counter += 1
+
         # Check for isolation
         if not parents and not children and art_type != 'SYSTEM_REQ':
             orphans['isolated'].append({
@@ -222,79 +347,32 @@ def find_orphans(graph: Dict[str, Any], artifacts: Dict[str, Any]) -> Dict[str,
                 'type': art_type,
                 'reason': "Artifact has no links at all"
             })
-    
-    return orphans
-
 
-def identify_gaps(
-    graph: Dict[str, Any],
-    artifacts: Dict[str, Any],
-    orphans: Dict[str, List[Dict[str, Any]]]
-) -> List[Dict[str, Any]]:
-    """Identify all traceability gaps."""
-    
-    gaps = []
-    gap_counter = 1
-    
-    # Gap Type 1: Orphaned artifacts with no parent
-    for orphan in orphans['no_parent']:
-        gap = {
-            'gap_id': f"GAP-{gap_counter:03d}",
-            'type': 'orphan_no_parent',
-            'severity': 'high',
-            'artifact_id': orphan['artifact_id'],
-            'artifact_type': orphan['type'],
-            'expected_parent_type': orphan['expected_parent_type'],
-            'description': f"{orphan['type']} has no parent link",
-            'reason': orphan['reason']
-        }
-        gaps.append(gap)
-        gap_counter += 1
-    
-    # Gap Type 2: Artifacts with no children (dead ends)
-    for orphan in orphans['no_children']:
-        # Determine severity based on type
-        severity = 'medium'
-        if orphan['type'] in ['SYSTEM_REQ', 'SYSTEM_REQ_DECOMPOSED']:
-            severity = 'critical'
-        elif orphan['type'] == 'HLR':
-            severity = 'high'
-        
-        gap = {
-            'gap_id': f"GAP-{gap_counter:03d}",
-            'type': 'orphan_no_children',
-            'severity': severity,
-            'artifact_id': orphan['artifact_id'],
-            'artifact_type': orphan['type'],
-            'expected_child_type': orphan['expected_child_type'],
-            'description': f"{orphan['type']} has no child links",
-            'reason': orphan['reason']
-        }
-        gaps.append(gap)
-        gap_counter += 1
-    
     # Gap Type 3: Incomplete chains
-    sys_reqs = [a for a in artifacts.values() if a['type'] == 'SYSTEM_REQ']
-    for sys_req in sys_reqs:
-        chains = trace_chain_forward(graph, sys_req['id'])
-        for chain in chains:
-            classification = classify_chain(chain, graph)
-            if classification in ['INCOMPLETE', 'PARTIAL', 'BROKEN']:
+    if chains_by_sys_req is None:
+        sys_req_ids = bucket_artifacts_by_type(artifacts).get('SYSTEM_REQ', [])
+        chains_by_sys_req = {s_id: trace_chains_flat(graph, s_id) for s_id in sys_req_ids}
+    nodes = graph['nodes']
+    for sys_id, (flat, spans) in chains_by_sys_req.items():
+        start_type = artifacts[sys_id]['type']
+        for (start, end), classification in zip(spans, classify_chains_for(flat, spans, start_type, nodes)):
+            if classification != 'COMPLETE':
+                # Materialize the chain list only for reported gaps
                 gap = {
                     'gap_id': f"GAP-{gap_counter:03d}",
                     'type': 'incomplete_chain',
                     'severity': 'high' if classification == 'INCOMPLETE' else 'medium',
-                    'chain': chain,
+                    'chain': flat[start:end],
                     'classification': classification,
-                    'break_point': chain[-1],
-                    'expected_depth': EXPECTED_CHAIN_DEPTH[sys_req['type']],
-                    'actual_depth': len(chain),
-                    'description': f"Incomplete trace chain from {sys_req['id']}"
+                    'break_point': flat[end - 1],
+                    'expected_depth': EXPECTED_CHAIN_DEPTH[start_type],
+                    'actual_depth': end - start,
+                    'description': f"Incomplete trace chain from {sys_id}"
                 }
                 gaps.append(gap)
                 gap_counter += 1
-    
-    return gaps
+
+    return orphans, gaps
 
 
 def analyze_traceability(
@@ -311,25 +389,29 @@ def analyze_traceability(
     # Build graph
     graph = build_trace_graph(artifacts, links)
     
-    # Compute coverage metrics
-    metrics = compute_coverage_metrics(graph, artifacts)
-    
-    # Find orphans
-    orphans = find_orphans(graph, artifacts)
-    
-    # Identify gaps
-    gaps = identify_gaps(graph, artifacts, orphans)
-    
+    # Compute coverage metrics (also buckets artifacts by type once)
+    metrics, by_type = compute_coverage_metrics(graph, artifacts)
+
+    # Trace each system requirement once; gaps and end-to-end coverage
+    # both consume the same chains
+    sys_req_ids = by_type.get('SYSTEM_REQ', [])
+    chains_by_sys_req = {s_id: trace_chains_flat(graph, s_id) for s_id in sys_req_ids}
+
+    # Find orphans and identify gaps in a single artifacts pass,
+    # tallying severities as we go instead of re-scanning gaps per level
+    orphans, gaps = identify_gaps(graph, artifacts, chains_by_sys_req)
+    severity_counts = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
+    for gap in gaps:
+        severity_counts[gap['severity']] += 1
+
     # Compute end-to-end coverage
-    sys_reqs = [a for a in artifacts.values() if a['type'] == 'SYSTEM_REQ']
     complete_chains = 0
     partial_chains = 0
     incomplete_chains = 0
-    
-    for sys_req in sys_reqs:
-        chains = trace_chain_forward(graph, sys_req['id'])
-        for chain in chains:
-            classification = classify_chain(chain, graph)
+
+    nodes = graph['nodes']
+    for sys_id, (flat, spans) in chains_by_sys_req.items():
+        for classification in classify_chains_for(flat, spans, artifacts[sys_id]['type'], nodes):
             if classification == 'COMPLETE':
                 complete_chains += 1
             elif classification == 'PARTIAL':
@@ -349,13 +431,13 @@ def analyze_traceability(
     
     # Build analysis report
     analysis = {
-        'analysis_timestamp': datetime.utcnow().isoformat() + 'Z',
+        'analysis_timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
         'artifact_counts': {
-            'system_req': len([a for a in artifacts.values() if a['type'] == 'SYSTEM_REQ']),
-            'system_req_decomposed': len([a for a in artifacts.values() if a['type'] == 'SYSTEM_REQ_DECOMPOSED']),
-            'hlr': len([a for a in artifacts.values() if a['type'] == 'HLR']),
-            'llr': len([a for a in artifacts.values() if a['type'] == 'LLR']),
-            'code_var': len([a for a in artifacts.values() if a['type'] == 'CODE_VAR']),
+            'system_req': len(by_type.get('SYSTEM_REQ', [])),
+            'system_req_decomposed': len(by_type.get('SYSTEM_REQ_DECOMPOSED', [])),
+            'hlr': len(by_type.get('HLR', [])),
+            'llr': len(by_type.get('LLR', [])),
+            'code_var': len(by_type.get('CODE_VAR', [])),
             'total': len(artifacts)
         },
         'link_counts': {
@@ -366,10 +448,7 @@ def analyze_traceability(
         'gaps': gaps,
         'gap_summary': {
             'total': len(gaps),
-            'critical': len([g for g in gaps if g['severity'] == 'critical']),
-            'high': len([g for g in gaps if g['severity'] == 'high']),
-            'medium': len([g for g in gaps if g['severity'] == 'medium']),
-            'low': len([g for g in gaps if g['severity'] == 'low'])
+            **severity_counts
         }
     }
     
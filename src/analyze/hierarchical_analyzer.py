@@ -1,7 +1,22 @@
 """Enhanced analysis for hierarchical traceability with orphan and completeness tracking."""
 
+import sys
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import Dict, List, Any, Set, Tuple
 
+import numpy as np
+
+# Enum codes for the SoA graph view; 255 marks unknown types
+TYPE_CODE = {
+    'SYSTEM_REQ': 0,
+    'SYSTEM_REQ_DECOMPOSED': 1,
+    'HLR': 2,
+    'LLR': 3,
+    'CODE_VAR': 4
+}
+
 
 def analyze_hierarchical_traceability(
     artifacts: Dict[str, Any],
@@ -21,18 +36,37 @@ def analyze_hierarchical_traceability(
     
     # Build graph structure
     graph = _build_graph(artifacts, links)
-    
-    # Analyze each layer
-    analysis = {
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
-        'system_requirements': _analyze_system_requirements(artifacts, graph),
-        'high_level_requirements': _analyze_hlr_layer(artifacts, graph),
-        'low_level_requirements': _analyze_llr_layer(artifacts, graph),
-        'variables': _analyze_variable_layer(artifacts, graph),
-        'chains': _analyze_chains(artifacts, graph),
-        'coverage_summary': _compute_coverage_summary(artifacts, graph),
-        'quality_metrics': _compute_quality_metrics(links)
-    }
+
+    # Bucket artifacts by type once; every layer analyzer reuses this
+    # instead of re-scanning artifacts.values()
+    by_type = {}
+    for artifact in artifacts.values():
+        by_type.setdefault(artifact['type'], []).append(artifact)
+
+    # Compute max chain depth per node once (O(V+E)) instead of
+    # re-enumerating all chains per lookup
+    max_depths = _compute_max_depths(graph)
+
+    # Analyze each layer; the analyzers are independent and read-only
+    # over the shared graph/artifacts, so run them concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            'system_requirements': executor.submit(
+                _analyze_system_requirements, artifacts, graph, max_depths, by_type),
+            'high_level_requirements': executor.submit(
+                _analyze_hlr_layer, artifacts, graph, by_type),
+            'low_level_requirements': executor.submit(
+                _analyze_llr_layer, artifacts, graph, by_type),
+            'variables': executor.submit(
+                _analyze_variable_layer, artifacts, graph, by_type),
+            'chains': executor.submit(_analyze_chains, artifacts, graph, by_type),
+        }
+        analysis = {
+            'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            **{key: future.result() for key, future in futures.items()},
+            'coverage_summary': _compute_coverage_summary(by_type, graph),
+            'quality_metrics': _compute_quality_metrics(links)
+        }
     
     # Print summary
     _print_analysis_summary(analysis)
@@ -43,47 +77,144 @@ def analyze_hierarchical_traceability(
 def _build_graph(artifacts: Dict[str, Any], links: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Build bidirectional graph from links."""
     
-    graph = {
-        'nodes': artifacts,
-        'edges_down': {},  # parent -> [children]
-        'edges_up': {},    # child -> [parents]
-        'links_by_source': {},  # source_id -> [link objects]
-        'links_by_target': {}   # target_id -> [link objects]
-    }
-    
+    # defaultdicts drop the key-membership check per link; callers only
+    # read via .get, so the containers can stay as built
+    edges_down = defaultdict(list)              # parent -> [children]
+    edges_up = defaultdict(list)                # child -> [parents]
+    edges_down_by_type = defaultdict(dict)      # parent -> {child type -> [children]}
+    edges_up_by_type = defaultdict(dict)        # child -> {parent type -> [parents]}
+    links_by_source = defaultdict(list)         # source_id -> [link objects]
+    links_by_target = defaultdict(list)         # target_id -> [link objects]
+
     for link in links:
         source_id = link['source_id']
         target_id = link['target_id']
-        
-        # Forward edges
-        if source_id not in graph['edges_down']:
-            graph['edges_down'][source_id] = []
-        graph['edges_down'][source_id].append(target_id)
-        
-        # Backward edges
-        if target_id not in graph['edges_up']:
-            graph['edges_up'][target_id] = []
-        graph['edges_up'][target_id].append(source_id)
-        
+
+        # Forward / backward edges
+        edges_down[source_id].append(target_id)
+        edges_up[target_id].append(source_id)
+
+        # Typed neighbor caches, so analyzers do one dict lookup instead
+        # of re-filtering neighbors by type on every pass
+        source = artifacts.get(source_id)
+        target = artifacts.get(target_id)
+        if target is not None:
+            edges_down_by_type[source_id].setdefault(target['type'], []).append(target_id)
+        if source is not None:
+            edges_up_by_type[target_id].setdefault(source['type'], []).append(source_id)
+
         # Link objects
-        if source_id not in graph['links_by_source']:
-            graph['links_by_source'][source_id] = []
-        graph['links_by_source'][source_id].append(link)
-        
-        if target_id not in graph['links_by_target']:
-            graph['links_by_target'][target_id] = []
-        graph['links_by_target'][target_id].append(link)
-    
-    return graph
+        links_by_source[source_id].append(link)
+        links_by_target[target_id].append(link)
+
+    # Structure-of-arrays view for traversal-heavy analyses: integer node
+    # indices, enum-coded types and CSR adjacency avoid per-hop string
+    # hashing and let type filters vectorize. Dict views above remain the
+    # API for everything that reports string IDs.
+    idx2id = list(artifacts)
+    id2idx = {art_id: i for i, art_id in enumerate(idx2id)}
+    type_codes = np.fromiter(
+        (TYPE_CODE.get(artifacts[art_id]['type'], 255) for art_id in idx2id),
+        dtype=np.uint8, count=len(idx2id)
+    )
+    down_indptr, down_indices = _build_csr(edges_down, id2idx)
+    up_indptr, up_indices = _build_csr(edges_up, id2idx)
+
+    return {
+        'nodes': artifacts,
+        'edges_down': dict(edges_down),
+        'edges_up': dict(edges_up),
+        'edges_down_by_type': dict(edges_down_by_type),
+        'edges_up_by_type': dict(edges_up_by_type),
+        'links_by_source': dict(links_by_source),
+        'links_by_target': dict(links_by_target),
+        'idx2id': idx2id,
+        'id2idx': id2idx,
+        'type_codes': type_codes,
+        'down_indptr': down_indptr,
+        'down_indices': down_indices,
+        'up_indptr': up_indptr,
+        'up_indices': up_indices
+    }
+
+
+def _build_csr(
+    adjacency: Dict[str, List[str]],
+    id2idx: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert a string-keyed adjacency dict to CSR (indptr, indices) arrays.
+
+    Neighbors referencing IDs outside the artifact corpus are dropped;
+    the dict views keep them for reporting.
+    """
+    n = len(id2idx)
+    counts = np.zeros(n + 1, dtype=np.int64)
+    for node_id, neighbors in adjacency.items():
+        i = id2idx.get(node_id)
+        if i is not None:
+            counts[i + 1] = sum(1 for nb in neighbors if nb in id2idx)
+
+    indptr = np.cumsum(counts).astype(np.int32)
+    indices = np.empty(int(indptr[-1]), dtype=np.int32)
+    for node_id, neighbors in adjacency.items():
+        i = id2idx.get(node_id)
+        if i is None:
+            continue
+        pos = indptr[i]
+        for nb in neighbors:
+            j = id2idx.get(nb)
+            if j is not None:
+                indices[pos] = j
+                pos += 1
+
+    return indptr, indices
+
+
+def _compute_max_depths(graph: Dict[str, Any]) -> Dict[str, int]:
+    """Compute the maximum chain depth below every node in one pass.
+
+    Iterative Kahn-style traversal from the leaves upward:
+    depth[n] = 1 + max(depth of children), leaves have depth 1. Nodes
+    caught in a cycle (never reducible to zero remaining children) keep
+    the leaf default. Replaces per-node chain enumeration, which was
+    exponential on branchy graphs.
+
+    Runs on the graph's CSR view: all bookkeeping lives in flat int
+    arrays, so the hot loop never hashes a string ID.
+    """
+    idx2id = graph['idx2id']
+    down_indptr = graph['down_indptr']
+    down_indices = graph['down_indices']
+    up_indptr = graph['up_indptr']
+    up_indices = graph['up_indices']
+
+    n = len(idx2id)
+    remaining = np.diff(down_indptr).astype(np.int32)
+    depths = np.ones(n, dtype=np.int32)
+    queue = deque(np.flatnonzero(remaining == 0).tolist())
+
+    while queue:
+        i = queue.popleft()
+        children = down_indices[down_indptr[i]:down_indptr[i + 1]]
+        if children.size:
+            depths[i] = 1 + depths[children].max()
+        for p in up_indices[up_indptr[i]:up_indptr[i + 1]]:
+            remaining[p] -= 1
+            if remaining[p] == 0:
+                queue.append(int(p))
+
+    return {idx2id[i]: int(depths[i]) for i in range(n)}
 
 
 def _analyze_system_requirements(
     artifacts: Dict[str, Any],
-    graph: Dict[str, Any]
+    graph: Dict[str, Any],
+    max_depths: Dict[str, int],
+    by_type: Dict[str, List[Dict[str, Any]]]
 ) -> Dict[str, Any]:
     """Analyze system requirements completeness."""
-    
-    sys_reqs = [a for a in artifacts.values() if a['type'] == 'SYSTEM_REQ']
+
+    sys_reqs = by_type.get('SYSTEM_REQ', [])
     
     complete = []
     partial = []
@@ -103,38 +234,28 @@ def _analyze_system_requirements(
             continue
         
         # Check if decomposed parts link to HLRs
-        decomposed_children = [
-            c for c in children 
-            if artifacts[c]['type'] == 'SYSTEM_REQ_DECOMPOSED'
+        down_by_type = graph['edges_down_by_type']
+        decomposed_children = down_by_type.get(req_id, {}).get('SYSTEM_REQ_DECOMPOSED', [])
+
+        hlr_linked = [
+            decomp_id for decomp_id in decomposed_children
+            if down_by_type.get(decomp_id, {}).get('HLR')
         ]
         
-        hlr_linked = []
-        for decomp_id in decomposed_children:
-            decomp_children = graph['edges_down'].get(decomp_id, [])
-            hlr_children = [
-                c for c in decomp_children 
-                if artifacts[c]['type'] == 'HLR'
-            ]
-            if hlr_children:
-                hlr_linked.append(decomp_id)
-        
         # Classify completeness
         if len(hlr_linked) == len(decomposed_children):
             # All decomposed parts link to HLRs - check chain depth
-            has_complete_chain = False
-            for decomp_id in decomposed_children:
-                chain_depth = _get_max_chain_depth(decomp_id, graph, artifacts)
-                if chain_depth >= 3:  # Reaches at least LLR
-                    has_complete_chain = True
-                    break
-            
+            # (>= 3 reaches at least LLR). One depth lookup per child,
+            # shared by the threshold check and the reported maximum.
+            depths = [max_depths.get(d, 0) for d in decomposed_children]
+            has_complete_chain = any(d >= 3 for d in depths)
+
             if has_complete_chain:
                 complete.append({
                     'id': req_id,
                     'text': req['text'],
                     'decomposed_parts': len(decomposed_children),
-                    'max_chain_depth': max(_get_max_chain_depth(d, graph, artifacts) 
-                                          for d in decomposed_children)
+                    'max_chain_depth': max(depths)
                 })
             else:
                 partial.append({
@@ -184,52 +305,66 @@ def _analyze_system_requirements(
 
 def _analyze_hlr_layer(
     artifacts: Dict[str, Any],
-    graph: Dict[str, Any]
+    graph: Dict[str, Any],
+    by_type: Dict[str, List[Dict[str, Any]]]
 ) -> Dict[str, Any]:
-    """Analyze HLR layer completeness and orphans."""
-    
-    hlrs = [a for a in artifacts.values() if a['type'] == 'HLR']
-    
+    """Analyze HLR layer completeness and orphans.
+
+    Works on the graph's SoA view: HLR nodes come from a vectorized type
+    filter, and parent/LLR-child counts come from indptr-bounded CSR
+    slices instead of per-node dict lookups. String IDs reappear only in
+    the reported records.
+    """
+
+    nodes = graph['nodes']
+    idx2id = graph['idx2id']
+    type_codes = graph['type_codes']
+    down_indptr = graph['down_indptr']
+    down_indices = graph['down_indices']
+    up_indptr = graph['up_indptr']
+
+    llr_code = TYPE_CODE['LLR']
+    hlr_indices = np.flatnonzero(type_codes == TYPE_CODE['HLR'])
+
     complete = []  # Has parent and children
     partial = []   # Has parent OR children but not both
     orphaned = []  # No parent and no children
-    
-    for hlr in hlrs:
-        hlr_id = hlr['id']
-        parents = graph['edges_up'].get(hlr_id, [])
-        children = graph['edges_down'].get(hlr_id, [])
-        
-        llr_children = [c for c in children if artifacts[c]['type'] == 'LLR']
-        
-        if parents and llr_children:
+
+    for i in hlr_indices:
+        parent_count = int(up_indptr[i + 1] - up_indptr[i])
+        children = down_indices[down_indptr[i]:down_indptr[i + 1]]
+        llr_count = int((type_codes[children] == llr_code).sum())
+
+        hlr_id = idx2id[i]
+        if parent_count and llr_count:
             complete.append({
                 'id': hlr_id,
-                'text': hlr['text'],
-                'parent_count': len(parents),
-                'llr_count': len(llr_children)
+                'text': nodes[hlr_id]['text'],
+                'parent_count': parent_count,
+                'llr_count': llr_count
             })
-        elif parents or llr_children:
+        elif parent_count or llr_count:
             issue = []
-            if not parents:
+            if not parent_count:
                 issue.append('No parent link (orphaned from SYS requirements)')
-            if not llr_children:
+            if not llr_count:
                 issue.append('No LLR children (not further decomposed)')
-            
+
             partial.append({
                 'id': hlr_id,
-                'text': hlr['text'],
-                'parent_count': len(parents),
-                'llr_count': len(llr_children),
+                'text': nodes[hlr_id]['text'],
+                'parent_count': parent_count,
+                'llr_count': llr_count,
                 'issue': '; '.join(issue)
             })
         else:
             orphaned.append({
                 'id': hlr_id,
-                'text': hlr['text'],
+                'text': nodes[hlr_id]['text'],
                 'issue': 'Completely isolated - no parent or children'
             })
-    
-    total = len(hlrs)
+
+    total = len(hlr_indices)
     return {
         'total': total,
         'complete': {
@@ -252,7 +387,8 @@ def _analyze_hlr_layer(
 
 def _analyze_llr_layer(
     artifacts: Dict[str, Any],
-    graph: Dict[str, Any]
+    graph: Dict[str, Any],
+    by_type: Dict[str, List[Dict[str, Any]]]
 ) -> Dict[str, Any]:
     """Analyze LLR layer completeness and orphans.
     
@@ -261,8 +397,8 @@ def _analyze_llr_layer(
     - If no variables: LLRs classified as implemented/orphaned (simpler)
     """
     
-    llrs = [a for a in artifacts.values() if a['type'] == 'LLR']
-    has_variables = any(a['type'] == 'CODE_VAR' for a in artifacts.values())
+    llrs = by_type.get('LLR', [])
+    has_variables = bool(by_type.get('CODE_VAR'))
     
     if not has_variables:
         # Simple classification: implemented (has HLR parent) or orphaned
@@ -271,8 +407,7 @@ def _analyze_llr_layer(
         
         for llr in llrs:
             llr_id = llr['id']
-            parents = graph['edges_up'].get(llr_id, [])
-            hlr_parents = [p for p in parents if artifacts[p]['type'] == 'HLR']
+            hlr_parents = graph['edges_up_by_type'].get(llr_id, {}).get('HLR', [])
             
             if hlr_parents:
                 implemented.append({
@@ -309,11 +444,8 @@ def _analyze_llr_layer(
     
     for llr in llrs:
         llr_id = llr['id']
-        parents = graph['edges_up'].get(llr_id, [])
-        children = graph['edges_down'].get(llr_id, [])
-        
-        hlr_parents = [p for p in parents if artifacts[p]['type'] == 'HLR']
-        var_children = [c for c in children if artifacts[c]['type'] == 'CODE_VAR']
+        hlr_parents = graph['edges_up_by_type'].get(llr_id, {}).get('HLR', [])
+        var_children = graph['edges_down_by_type'].get(llr_id, {}).get('CODE_VAR', [])
         
         if hlr_parents and var_children:
             complete.append({
@@ -366,20 +498,19 @@ def _analyze_llr_layer(
 
 def _analyze_variable_layer(
     artifacts: Dict[str, Any],
-    graph: Dict[str, Any]
+    graph: Dict[str, Any],
+    by_type: Dict[str, List[Dict[str, Any]]]
 ) -> Dict[str, Any]:
     """Analyze variable traceability."""
-    
-    variables = [a for a in artifacts.values() if a['type'] == 'CODE_VAR']
+
+    variables = by_type.get('CODE_VAR', [])
     
     traced = []
     orphaned = []
     
     for var in variables:
         var_id = var['id']
-        parents = graph['edges_up'].get(var_id, [])
-        
-        llr_parents = [p for p in parents if artifacts[p]['type'] == 'LLR']
+        llr_parents = graph['edges_up_by_type'].get(var_id, {}).get('LLR', [])
         
         if llr_parents:
             traced.append({
@@ -413,138 +544,239 @@ def _analyze_variable_layer(
 
 def _analyze_chains(
     artifacts: Dict[str, Any],
-    graph: Dict[str, Any]
+    graph: Dict[str, Any],
+    by_type: Dict[str, List[Dict[str, Any]]]
 ) -> Dict[str, Any]:
-    """Analyze end-to-end trace chains."""
-    
-    sys_reqs = [a for a in artifacts.values() if a['type'] == 'SYSTEM_REQ']
-    
-    chains_analysis = {
-        'complete_chains': [],
-        'partial_chains': [],
-        'broken_chains': []
-    }
-    
+    """Analyze end-to-end trace chains.
+
+    Instead of enumerating every root-to-leaf path (exponential on branchy
+    or mis-linked graphs), collapse strongly connected components with
+    Tarjan's algorithm and answer depth/reachability questions with a DP
+    over the condensation DAG in O(V+E). Each system requirement is
+    classified once from its component's DP values, with one
+    representative deepest chain reported per requirement. Components of
+    size > 1 only arise from mis-linked cyclic trace data and are
+    reported as cyclic_clusters.
+    """
+
+    sys_reqs = by_type.get('SYSTEM_REQ', [])
+
+    idx2id = graph['idx2id']
+    id2idx = graph['id2idx']
+    type_codes = graph['type_codes']
+    down_indptr = graph['down_indptr']
+    down_indices = graph['down_indices']
+    n = len(idx2id)
+
+    scc_id, sccs = _tarjan_scc(down_indptr, down_indices, n)
+
+    # Tarjan emits components in reverse topological order (sinks first),
+    # so successors already carry final DP values when a component is
+    # processed. depth counts nodes along the deepest downward path;
+    # reaches tracks whether any CODE_VAR is reachable.
+    codevar_code = TYPE_CODE['CODE_VAR']
+    scc_depth = [0] * len(sccs)
+    scc_reaches = [False] * len(sccs)
+    for s, members in enumerate(sccs):
+        reaches = any(type_codes[m] == codevar_code for m in members)
+        best_child_depth = 0
+        for m in members:
+            for ptr in range(int(down_indptr[m]), int(down_indptr[m + 1])):
+                child_scc = scc_id[int(down_indices[ptr])]
+                if child_scc == s:
+                    continue
+                if scc_reaches[child_scc]:
+                    reaches = True
+                if scc_depth[child_scc] > best_child_depth:
+                    best_child_depth = scc_depth[child_scc]
+        scc_depth[s] = len(members) + best_child_depth
+        scc_reaches[s] = reaches
+
+    DISPLAY_CAP = 10
+
+    counts = {'complete': 0, 'partial': 0, 'broken': 0}
+    samples = {'complete': [], 'partial': [], 'broken': []}
+
     for sys_req in sys_reqs:
-        chains = _find_all_chains(sys_req['id'], graph, artifacts)
-        
-        for chain in chains:
-            chain_types = [artifacts[node_id]['type'] for node_id in chain]
-            chain_depth = len(chain)
-            terminal_type = chain_types[-1] if chain_types else None
-            
-            chain_info = {
+        start_idx = id2idx.get(sys_req['id'])
+        if start_idx is None:
+            continue
+
+        s = scc_id[start_idx]
+        depth = scc_depth[s]
+
+        # Complete: reaches CODE_VAR
+        if scc_reaches[s] and depth >= 4:
+            category = 'complete'
+        # Partial: has depth but doesn't reach CODE_VAR
+        elif depth >= 2:
+            category = 'partial'
+        # Broken: too short
+        else:
+            category = 'broken'
+
+        counts[category] += 1
+        # Only the first DISPLAY_CAP chains per category are reported,
+        # so skip materializing chains past the cap
+        sample = samples[category]
+        if len(sample) < DISPLAY_CAP:
+            chain = [
+                idx2id[i] for i in _deepest_chain(
+                    start_idx, down_indptr, down_indices, scc_id, scc_depth
+                )
+            ]
+            sample.append({
                 'system_req': sys_req['id'],
                 'chain': chain,
-                'depth': chain_depth,
-                'types': chain_types
-            }
-            
-            # Complete: reaches CODE_VAR
-            if terminal_type == 'CODE_VAR' and chain_depth >= 4:
-                chains_analysis['complete_chains'].append(chain_info)
-            # Partial: has depth but doesn't reach CODE_VAR
-            elif chain_depth >= 2:
-                chains_analysis['partial_chains'].append(chain_info)
-            # Broken: too short
-            else:
-                chains_analysis['broken_chains'].append(chain_info)
-    
-    total_chains = sum(len(v) for v in chains_analysis.values())
-    
+                'depth': depth,
+                'types': [artifacts[node_id]['type'] for node_id in chain]
+            })
+
+    total_chains = sum(counts.values())
+
+    cyclic_clusters = [
+        {'size': len(members), 'members': sorted(idx2id[m] for m in members)}
+        for members in sccs if len(members) > 1
+    ]
+
     return {
         'total_chains': total_chains,
         'complete': {
-            'count': len(chains_analysis['complete_chains']),
-            'percentage': (len(chains_analysis['complete_chains']) / total_chains * 100) if total_chains > 0 else 0,
-            'chains': chains_analysis['complete_chains'][:10]  # Limit for display
+            'count': counts['complete'],
+            'percentage': (counts['complete'] / total_chains * 100) if total_chains > 0 else 0,
+            'chains': samples['complete']
         },
         'partial': {
-            'count': len(chains_analysis['partial_chains']),
-            'percentage': (len(chains_analysis['partial_chains']) / total_chains * 100) if total_chains > 0 else 0,
-            'chains': chains_analysis['partial_chains'][:10]
+            'count': counts['partial'],
+            'percentage': (counts['partial'] / total_chains * 100) if total_chains > 0 else 0,
+            'chains': samples['partial']
         },
         'broken': {
-            'count': len(chains_analysis['broken_chains']),
-            'percentage': (len(chains_analysis['broken_chains']) / total_chains * 100) if total_chains > 0 else 0,
-            'chains': chains_analysis['broken_chains'][:10]
-        }
+            'count': counts['broken'],
+            'percentage': (counts['broken'] / total_chains * 100) if total_chains > 0 else 0,
+            'chains': samples['broken']
+        },
+        'cyclic_clusters': cyclic_clusters
     }
 
 
-def _find_all_chains(
-    start_id: str,
-    graph: Dict[str, Any],
-    artifacts: Dict[str, Any]
-) -> List[List[str]]:
-    """Find all trace chains from a starting node using DFS."""
-    
-    chains = []
-    
-    def dfs(node_id: str, path: List[str], visited: Set[str]):
-        if node_id in visited:
-            return
-        
-        current_path = path + [node_id]
-        visited_copy = visited | {node_id}
-        
-        children = graph['edges_down'].get(node_id, [])
-        
-        if not children:
-            chains.append(current_path)
-        else:
-            for child_id in children:
-                dfs(child_id, current_path, visited_copy)
-    
-    dfs(start_id, [], set())
-    return chains
+def _tarjan_scc(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    n: int
+) -> Tuple[List[int], List[List[int]]]:
+    """Iterative Tarjan SCC over a CSR adjacency.
 
+    Returns (scc_id per node, component member lists). Components come
+    out in reverse topological order of the condensation.
+    """
+    counter = 0
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    node_stack = []
+    scc_id = [-1] * n
+    sccs = []
 
-def _get_max_chain_depth(
-    start_id: str,
-    graph: Dict[str, Any],
-    artifacts: Dict[str, Any]
-) -> int:
-    """Get maximum chain depth from a node."""
-    
-    chains = _find_all_chains(start_id, graph, artifacts)
-    return max(len(chain) for chain in chains) if chains else 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        node_stack.append(root)
+        on_stack[root] = True
+        work = [(root, int(indptr[root]))]
+
+        while work:
+            v, ptr = work[-1]
+            if ptr < indptr[v + 1]:
+                work[-1] = (v, ptr + 1)
+                w = int(indices[ptr])
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    node_stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, int(indptr[w])))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == index[v]:
+                    members = []
+                    while True:
+                        w = node_stack.pop()
+                        on_stack[w] = False
+                        scc_id[w] = len(sccs)
+                        members.append(w)
+                        if w == v:
+                            break
+                    sccs.append(members)
+
+    return scc_id, sccs
+
+
+def _deepest_chain(
+    start_idx: int,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    scc_id: List[int],
+    scc_depth: List[int]
+) -> List[int]:
+    """Walk one deepest downward chain, guided by the condensation DP."""
+    chain = [start_idx]
+    seen = {start_idx}
+    node = start_idx
+
+    while True:
+        best_child = None
+        best_depth = -1
+        for ptr in range(int(indptr[node]), int(indptr[node + 1])):
+            child = int(indices[ptr])
+            if child in seen:
+                continue
+            child_depth = scc_depth[scc_id[child]]
+            if child_depth > best_depth:
+                best_depth = child_depth
+                best_child = child
+        if best_child is None:
+            return chain
+        chain.append(best_child)
+        seen.add(best_child)
+        node = best_child
 
 
 def _compute_coverage_summary(
-    artifacts: Dict[str, Any],
+    by_type: Dict[str, List[Dict[str, Any]]],
     graph: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Compute overall coverage summary."""
-    
-    # Count by type
-    by_type = {}
-    for artifact in artifacts.values():
-        art_type = artifact['type']
-        by_type[art_type] = by_type.get(art_type, 0) + 1
-    
-    # Count linked
-    linked_count = {}
-    for art_type in by_type:
-        linked = sum(
-            1 for a in artifacts.values()
-            if a['type'] == art_type and (
-                graph['edges_up'].get(a['id'], []) or
-                graph['edges_down'].get(a['id'], [])
-            )
-        )
-        linked_count[art_type] = linked
-    
-    # Coverage percentages
+
+    edges_up = graph['edges_up']
+    edges_down = graph['edges_down']
+
+    # Single pass over all artifacts incrementing per-type counters; the
+    # edge dicts only hold keys with edges, so membership tests suffice
+    linked_count = {art_type: 0 for art_type in by_type}
+    for art_type, bucket in by_type.items():
+        for a in bucket:
+            aid = a['id']
+            if aid in edges_up or aid in edges_down:
+                linked_count[art_type] += 1
+
     coverage = {}
-    for art_type, total in by_type.items():
-        linked = linked_count.get(art_type, 0)
+    for art_type, bucket in by_type.items():
+        total = len(bucket)
+        linked = linked_count[art_type]
         coverage[art_type] = {
             'total': total,
             'linked': linked,
             'percentage': (linked / total * 100) if total > 0 else 0
         }
-    
+
     return coverage
 
 
@@ -560,12 +792,16 @@ def _compute_quality_metrics(links: List[Dict[str, Any]]) -> Dict[str, Any]:
             'low_confidence': 0
         }
     
-    confidences = [link['confidence'] for link in links]
-    avg_confidence = sum(confidences) / len(confidences)
-    
-    high = sum(1 for c in confidences if c >= 0.7)
-    medium = sum(1 for c in confidences if 0.5 <= c < 0.7)
-    low = sum(1 for c in confidences if c < 0.5)
+    # Single vectorized pass over confidences instead of three Python
+    # loops; itemgetter keeps the extraction out of bytecode dispatch
+    confidences = np.fromiter(
+        map(itemgetter('confidence'), links), dtype=np.float32, count=len(links)
+    )
+    avg_confidence = float(confidences.mean())
+
+    high = int((confidences >= 0.7).sum())
+    low = int((confidences < 0.5).sum())
+    medium = len(links) - high - low
     
     return {
         'total_links': len(links),
@@ -578,61 +814,66 @@ def _compute_quality_metrics(links: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 def _print_analysis_summary(analysis: Dict[str, Any]) -> None:
     """Print human-readable summary of analysis."""
-    
-    print("\n" + "="*60)
-    print("HIERARCHICAL TRACEABILITY ANALYSIS SUMMARY")
-    print("="*60)
-    
+
+    # Assemble the summary in a line buffer and emit it with one write;
+    # per-line print calls each flush through the interpreter's I/O layer.
+    lines = []
+    lines.append("\n" + "="*60)
+    lines.append("HIERARCHICAL TRACEABILITY ANALYSIS SUMMARY")
+    lines.append("="*60)
+
     # System Requirements
-    sys = analysis['system_requirements']
-    print(f"\nSYSTEM REQUIREMENTS ({sys['total']} total):")
-    print(f"  ✓ Complete: {sys['complete']['count']} ({sys['complete']['percentage']:.1f}%)")
-    print(f"  ⚠ Partial: {sys['partial']['count']} ({sys['partial']['percentage']:.1f}%)")
-    print(f"  ✗ No decomposition: {sys['no_decomposition']['count']} ({sys['no_decomposition']['percentage']:.1f}%)")
-    
+    sys_reqs = analysis['system_requirements']
+    lines.append(f"\nSYSTEM REQUIREMENTS ({sys_reqs['total']} total):")
+    lines.append(f"  ✓ Complete: {sys_reqs['complete']['count']} ({sys_reqs['complete']['percentage']:.1f}%)")
+    lines.append(f"  ⚠ Partial: {sys_reqs['partial']['count']} ({sys_reqs['partial']['percentage']:.1f}%)")
+    lines.append(f"  ✗ No decomposition: {sys_reqs['no_decomposition']['count']} ({sys_reqs['no_decomposition']['percentage']:.1f}%)")
+
     # HLRs
     hlr = analysis['high_level_requirements']
-    print(f"\nHIGH-LEVEL REQUIREMENTS ({hlr['total']} total):")
-    print(f"  ✓ Complete: {hlr['complete']['count']} ({hlr['complete']['percentage']:.1f}%)")
-    print(f"  ⚠ Partial: {hlr['partial']['count']} ({hlr['partial']['percentage']:.1f}%)")
-    print(f"  ✗ Orphaned: {hlr['orphaned']['count']} ({hlr['orphaned']['percentage']:.1f}%)")
-    
+    lines.append(f"\nHIGH-LEVEL REQUIREMENTS ({hlr['total']} total):")
+    lines.append(f"  ✓ Complete: {hlr['complete']['count']} ({hlr['complete']['percentage']:.1f}%)")
+    lines.append(f"  ⚠ Partial: {hlr['partial']['count']} ({hlr['partial']['percentage']:.1f}%)")
+    lines.append(f"  ✗ Orphaned: {hlr['orphaned']['count']} ({hlr['orphaned']['percentage']:.1f}%)")
+
     # LLRs
     llr = analysis['low_level_requirements']
-    print(f"\nLOW-LEVEL REQUIREMENTS ({llr['total']} total):")
+    lines.append(f"\nLOW-LEVEL REQUIREMENTS ({llr['total']} total):")
     if 'complete' in llr:
         # Detailed format (with variables)
-        print(f"  ✓ Complete: {llr['complete']['count']} ({llr['complete']['percentage']:.1f}%)")
-        print(f"  ⚠ Partial: {llr['partial']['count']} ({llr['partial']['percentage']:.1f}%)")
-        print(f"  ✗ Orphaned: {llr['orphaned']['count']} ({llr['orphaned']['percentage']:.1f}%)")
+        lines.append(f"  ✓ Complete: {llr['complete']['count']} ({llr['complete']['percentage']:.1f}%)")
+        lines.append(f"  ⚠ Partial: {llr['partial']['count']} ({llr['partial']['percentage']:.1f}%)")
+        lines.append(f"  ✗ Orphaned: {llr['orphaned']['count']} ({llr['orphaned']['percentage']:.1f}%)")
     else:
         # Simple format (no variables)
-        print(f"  ✓ Implemented: {llr['implemented']['count']} ({llr['implemented']['percentage']:.1f}%)")
-        print(f"  ✗ Orphaned: {llr['orphaned']['count']} ({llr['orphaned']['percentage']:.1f}%)")
-    
+        lines.append(f"  ✓ Implemented: {llr['implemented']['count']} ({llr['implemented']['percentage']:.1f}%)")
+        lines.append(f"  ✗ Orphaned: {llr['orphaned']['count']} ({llr['orphaned']['percentage']:.1f}%)")
+
     # Variables
     var = analysis['variables']
-    print(f"\nVARIABLES ({var['total']} total):")
-    print(f"  ✓ Traced: {var['traced']['count']} ({var['traced']['percentage']:.1f}%)")
-    print(f"  ✗ Orphaned: {var['orphaned']['count']} ({var['orphaned']['percentage']:.1f}%)")
-    
+    lines.append(f"\nVARIABLES ({var['total']} total):")
+    lines.append(f"  ✓ Traced: {var['traced']['count']} ({var['traced']['percentage']:.1f}%)")
+    lines.append(f"  ✗ Orphaned: {var['orphaned']['count']} ({var['orphaned']['percentage']:.1f}%)")
+
     # Chains
     chains = analysis['chains']
-    print(f"\nTRACE CHAINS ({chains['total_chains']} total):")
-    print(f"  ✓ Complete: {chains['complete']['count']} ({chains['complete']['percentage']:.1f}%)")
-    print(f"  ⚠ Partial: {chains['partial']['count']} ({chains['partial']['percentage']:.1f}%)")
-    print(f"  ✗ Broken: {chains['broken']['count']} ({chains['broken']['percentage']:.1f}%)")
-    
+    lines.append(f"\nTRACE CHAINS ({chains['total_chains']} total):")
+    lines.append(f"  ✓ Complete: {chains['complete']['count']} ({chains['complete']['percentage']:.1f}%)")
+    lines.append(f"  ⚠ Partial: {chains['partial']['count']} ({chains['partial']['percentage']:.1f}%)")
+    lines.append(f"  ✗ Broken: {chains['broken']['count']} ({chains['broken']['percentage']:.1f}%)")
+
     # Quality
     quality = analysis['quality_metrics']
-    print(f"\nLINK QUALITY:")
-    print(f"  Total links: {quality['total_links']}")
-    print(f"  Average confidence: {quality['avg_confidence']:.2f}")
-    print(f"  High confidence (≥0.7): {quality['high_confidence']['count']} ({quality['high_confidence']['percentage']:.1f}%)")
-    print(f"  Medium confidence (0.5-0.7): {quality['medium_confidence']['count']} ({quality['medium_confidence']['percentage']:.1f}%)")
-    
-    print("\n" + "="*60)
+    lines.append(f"\nLINK QUALITY:")
+    lines.append(f"  Total links: {quality['total_links']}")
+    lines.append(f"  Average confidence: {quality['avg_confidence']:.2f}")
+    lines.append(f"  High confidence (≥0.7): {quality['high_confidence']['count']} ({quality['high_confidence']['percentage']:.1f}%)")
+    lines.append(f"  Medium confidence (0.5-0.7): {quality['medium_confidence']['count']} ({quality['medium_confidence']['percentage']:.1f}%)")
+
+    lines.append("\n" + "="*60)
+
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 # Missing import at top
-from datetime import datetime
+from datetime import datetime, timezone
@@ -1,44 +1,77 @@
 """LLM-based gap reasoning with rate limiting."""
 
 import json
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, List
 from groq import Groq
 from src.decompose.prompts import GAP_REASONING_SYSTEM_PROMPT, GAP_REASONING_USER_PROMPT
 from src.utils.api_utils import rate_limiter, api_tracker
 
+# str.format re-parses the template on every call; string.Template compiles
+# its placeholder regex once, so convert the format-style prompt ({name},
+# {{ }} escapes) to $-style at import and substitute per gap.
+_GAP_PROMPT_TEMPLATE = string.Template(
+    GAP_REASONING_USER_PROMPT
+    .replace('{{', '\x00').replace('}}', '\x01')
+    .replace('{', '${')
+    .replace('\x00', '{').replace('\x01', '}')
+)
+
+
+def _gap_artifact_id(gap: Dict[str, Any]) -> str:
+    """Resolve the artifact a gap refers to, without a [None] allocation
+    on the chain fallback."""
+    artifact_id = gap.get('artifact_id')
+    if not artifact_id:
+        chain = gap.get('chain')
+        artifact_id = chain[-1] if chain else None
+    return artifact_id
+
 
 def gather_gap_context(
     gap: Dict[str, Any],
     artifacts: Dict[str, Any],
     graph: Dict[str, Any],
-    indexer
+    indexer,
+    nm_cache: Dict[str, List[Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
-    """Gather relevant context for gap reasoning."""
-    
+    """Gather relevant context for gap reasoning.
+
+    nm_cache, when provided, memoizes near-miss lookups per artifact so
+    artifacts that appear in several gaps only hit the index once.
+    """
+
     context = {}
-    
-    artifact_id = gap.get('artifact_id') or (gap.get('chain', [None])[-1])
-    
+
+    artifact_id = _gap_artifact_id(gap)
+
     if artifact_id:
         artifact = artifacts.get(artifact_id, {})
         context['artifact'] = artifact
         context['artifact_id'] = artifact_id
         context['artifact_text'] = artifact.get('text', '')
         context['artifact_type'] = artifact.get('type', '')
-        
+
         # Get parents and children
         context['parents'] = graph.get('edges_up', {}).get(artifact_id, [])
         context['children'] = graph.get('edges_down', {}).get(artifact_id, [])
-        
-        # Find near-miss candidates
-        context['near_misses'] = find_near_misses(
-            artifact_id,
-            artifacts,
-            indexer,
-            threshold=0.35,
-            top_k=3
-        )
-    
+
+        # Find near-miss candidates (cached when a shared cache is supplied)
+        if nm_cache is not None and artifact_id in nm_cache:
+            context['near_misses'] = nm_cache[artifact_id]
+        else:
+            near_misses = find_near_misses(
+                artifact_id,
+                artifacts,
+                indexer,
+                threshold=0.35,
+                top_k=3
+            )
+            if nm_cache is not None:
+                nm_cache[artifact_id] = near_misses
+            context['near_misses'] = near_misses
+
     return context
 
 
@@ -78,17 +111,68 @@ def find_near_misses(
     return near_misses[:top_k]
 
 
+def find_near_misses_batch(
+    artifact_ids: List[str],
+    artifacts: Dict[str, Any],
+    indexer,
+    threshold: float = 0.35,
+    top_k: int = 3
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Find near misses for many artifacts with a single batched index search."""
+
+    near_misses_by_id = {}
+
+    # Collect embeddings; artifacts without one get an empty result up front
+    query_ids = []
+    query_embeddings = []
+    for artifact_id in artifact_ids:
+        embedding = indexer.get_embedding(artifact_id)
+        if embedding is None:
+            near_misses_by_id[artifact_id] = []
+        else:
+            query_ids.append(artifact_id)
+            query_embeddings.append(embedding)
+
+    if not query_ids:
+        return near_misses_by_id
+
+    batch_results = indexer.search_similar_batch(
+        query_embeddings,
+        top_k=top_k * 2,
+        threshold=threshold
+    )
+
+    for artifact_id, candidates in zip(query_ids, batch_results):
+        near_misses = []
+        for candidate_id, score in candidates:
+            if candidate_id != artifact_id:
+                candidate = artifacts.get(candidate_id)
+                if candidate:
+                    near_misses.append({
+                        'candidate_id': candidate_id,
+                        'similarity': score,
+                        'candidate_type': candidate['type'],
+                        'candidate_text': candidate['text'][:200]
+                    })
+        near_misses_by_id[artifact_id] = near_misses[:top_k]
+
+    return near_misses_by_id
+
+
 def explain_gap(
     gap: Dict[str, Any],
     artifacts: Dict[str, Any],
     graph: Dict[str, Any],
     indexer,
-    groq_client: Groq
+    groq_client: Groq,
+    nm_cache: Dict[str, List[Dict[str, Any]]] = None,
+    parents_str_cache: Dict[str, str] = None,
+    children_str_cache: Dict[str, str] = None
 ) -> Dict[str, Any]:
     """Generate detailed explanation for a gap using LLM."""
-    
+
     # Gather context
-    context = gather_gap_context(gap, artifacts, graph, indexer)
+    context = gather_gap_context(gap, artifacts, graph, indexer, nm_cache)
     
     # Build prompt
     near_miss_text = ""
@@ -98,15 +182,27 @@ def explain_gap(
     if not near_miss_text:
         near_miss_text = "\nNone found"
     
-    user_prompt = GAP_REASONING_USER_PROMPT.format(
+    # Joined ID strings come from the shared caches when provided, so
+    # artifacts repeated across gaps are only formatted once
+    artifact_id = context.get('artifact_id')
+    if parents_str_cache is not None:
+        parent_ids = parents_str_cache.get(artifact_id, 'None')
+    else:
+        parent_ids = ', '.join(context.get('parents', [])) if context.get('parents') else 'None'
+    if children_str_cache is not None:
+        children_ids = children_str_cache.get(artifact_id, 'None')
+    else:
+        children_ids = ', '.join(context.get('children', [])) if context.get('children') else 'None'
+
+    user_prompt = _GAP_PROMPT_TEMPLATE.substitute(
         gap_type=gap.get('type', 'unknown'),
         severity=gap.get('severity', 'unknown'),
         artifact_id=context.get('artifact_id', 'N/A'),
         artifact_type=context.get('artifact_type', 'N/A'),
         artifact_text=context.get('artifact_text', 'N/A'),
-        parent_ids=', '.join(context.get('parents', [])) if context.get('parents') else 'None',
+        parent_ids=parent_ids,
         parent_count=len(context.get('parents', [])),
-        children_ids=', '.join(context.get('children', [])) if context.get('children') else 'None',
+        children_ids=children_ids,
         children_count=len(context.get('children', [])),
         expected_parent_type=gap.get('expected_parent_type', 'N/A'),
         expected_child_type=gap.get('expected_child_type', 'N/A'),
@@ -170,11 +266,32 @@ def explain_all_gaps(
         return gaps
     
     print(f"Generating LLM reasoning for {len(gaps)} gaps...")
-    
-    enhanced_gaps = []
-    for i, gap in enumerate(gaps, 1):
-        print(f"  Processing gap {i}/{len(gaps)}: {gap['gap_id']}")
-        enhanced_gap = explain_gap(gap, artifacts, graph, indexer, groq_client)
-        enhanced_gaps.append(enhanced_gap)
-    
-    return enhanced_gaps
+
+    # Gap explanations are independent API calls dominated by network latency,
+    # so dispatch them concurrently. The shared rate_limiter still spaces the
+    # actual requests. explain_gap mutates each gap in place, so returning the
+    # original list preserves input order regardless of completion order.
+    # Pre-fill the per-artifact near-miss cache with one batched FAISS search
+    # over every artifact the gaps reference, instead of one query per gap.
+    gap_artifact_ids = {_gap_artifact_id(gap) for gap in gaps}
+    gap_artifact_ids.discard(None)
+    nm_cache = find_near_misses_batch(sorted(gap_artifact_ids), artifacts, indexer)
+
+    # Join parent/children ID strings once per artifact; gaps that share
+    # an artifact reuse the formatted string in their prompts
+    parents_str_cache = {aid: ', '.join(ps) for aid, ps in graph.get('edges_up', {}).items()}
+    children_str_cache = {aid: ', '.join(cs) for aid, cs in graph.get('edges_down', {}).items()}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(
+                explain_gap, gap, artifacts, graph, indexer, groq_client,
+                nm_cache, parents_str_cache, children_str_cache
+            ): gap
+            for gap in gaps
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            print(f"  Processed gap {done}/{len(gaps)}: {futures[future]['gap_id']}")
+            future.result()
+
+    return gaps
@@ -4,7 +4,8 @@ Provides consistent analysis across all outputs with detailed reasoning.
 """
 
 from typing import Dict, Any, List, Tuple
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 
 def analyze_unified_traceability(
@@ -19,14 +20,19 @@ def analyze_unified_traceability(
     
     # Build graph structures
     graph = _build_graph(artifacts, links)
-    
-    # Analyze each layer with consistent logic
-    system_reqs_analysis = _analyze_system_requirements(artifacts, graph)
-    hlr_analysis = _analyze_high_level_requirements(artifacts, graph)
-    llr_analysis = _analyze_low_level_requirements(artifacts, graph)
-    
-    # Build trace paths for all requirements
-    trace_paths = _build_all_trace_paths(artifacts, graph)
+
+    # Layer analyses and trace-path building are independent and
+    # read-only over the frozen graph, so run them concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        sys_future = executor.submit(_analyze_system_requirements, artifacts, graph)
+        hlr_future = executor.submit(_analyze_high_level_requirements, artifacts, graph)
+        llr_future = executor.submit(_analyze_low_level_requirements, artifacts, graph)
+        paths_future = executor.submit(_build_all_trace_paths, artifacts, graph)
+
+        system_reqs_analysis = sys_future.result()
+        hlr_analysis = hlr_future.result()
+        llr_analysis = llr_future.result()
+        trace_paths = paths_future.result()
     
     # Generate quality metrics
     quality_metrics = _calculate_quality_metrics(
@@ -45,7 +51,7 @@ def analyze_unified_traceability(
         'metadata': {
             'total_artifacts': len(artifacts),
             'total_links': len(links),
-            'has_variables': any(a['type'] == 'CODE_VAR' for a in artifacts.values())
+            'has_variables': 'CODE_VAR' in graph['by_type']
         }
     }
 
@@ -56,25 +62,54 @@ def _build_graph(
 ) -> Dict[str, Any]:
     """Build bidirectional graph from artifacts and links."""
     
-    edges_down = defaultdict(list)  # parent -> children
-    edges_up = defaultdict(list)    # child -> parents
-    
+    edges_down = defaultdict(list)          # parent -> children
+    edges_up = defaultdict(list)            # child -> parents
+    edges_down_by_type = defaultdict(list)  # (parent, child type) -> children
+    edges_up_by_type = defaultdict(list)    # (child, parent type) -> parents
+
     for link in links:
         # Handle both 'source'/'target' and 'source_id'/'target_id' formats
         source = link.get('source') or link.get('source_id')
         target = link.get('target') or link.get('target_id')
-        
+
         if source and target:
             edges_down[source].append(target)
             edges_up[target].append(source)
-    
+
+            # Resolve endpoint types once here so typed neighbor queries
+            # become a single lookup instead of re-filtering edge lists
+            child = artifacts.get(target)
+            if child is not None:
+                edges_down_by_type[(source, child['type'])].append(target)
+            parent = artifacts.get(source)
+            if parent is not None:
+                edges_up_by_type[(target, parent['type'])].append(source)
+
+    # Freeze to plain dicts of tuples: the adjacency never changes after
+    # build, tuples are smaller and iterate faster than lists, and plain
+    # dicts avoid defaultdict's insert-on-miss on stray [] lookups
     return {
-        'edges_down': edges_down,
-        'edges_up': edges_up,
-        'artifacts': artifacts
+        'edges_down': {k: tuple(v) for k, v in edges_down.items()},
+        'edges_up': {k: tuple(v) for k, v in edges_up.items()},
+        'edges_down_by_type': {k: tuple(v) for k, v in edges_down_by_type.items()},
+        'edges_up_by_type': {k: tuple(v) for k, v in edges_up_by_type.items()},
+        'artifacts': artifacts,
+        'by_type': _bucket_by_type(artifacts)
     }
 
 
+def _bucket_by_type(artifacts: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Bucket artifacts by type in one pass.
+
+    Every layer analyzer reads its slice from these buckets instead of
+    re-filtering artifacts.values() with per-element type comparisons.
+    """
+    buckets = {}
+    for artifact in artifacts.values():
+        buckets.setdefault(artifact['type'], []).append(artifact)
+    return buckets
+
+
 def _analyze_system_requirements(
     artifacts: Dict[str, Any],
     graph: Dict[str, Any]
@@ -88,8 +123,8 @@ def _analyze_system_requirements(
     - NOT_IMPLEMENTED: No decomposition or no downstream links
     """
     
-    sys_reqs = [a for a in artifacts.values() if a['type'] == 'SYSTEM_REQ']
-    
+    sys_reqs = graph['by_type'].get('SYSTEM_REQ', [])
+
     fully_implemented = []
     partially_implemented = []
     not_implemented = []
@@ -193,21 +228,24 @@ def _analyze_high_level_requirements(
     - ORPHANED: No parent and no children
     """
     
-    hlrs = [a for a in artifacts.values() if a['type'] == 'HLR']
-    
+    hlrs = graph['by_type'].get('HLR', [])
+
+    # Hoist hot lookups out of the loop
+    up_by_type = graph['edges_up_by_type']
+
     fully_implemented = []
     partially_implemented = []
     orphaned = []
-    
+
     for hlr in hlrs:
         hlr_id = hlr['id']
-        
-        # Check for parent (SYSTEM_REQ_DECOMPOSED or SYSTEM_REQ)
-        parents = graph['edges_up'].get(hlr_id, [])
-        valid_parents = [
-            p for p in parents 
-            if artifacts[p]['type'] in ['SYSTEM_REQ_DECOMPOSED', 'SYSTEM_REQ']
-        ]
+
+        # Check for parent (SYSTEM_REQ_DECOMPOSED or SYSTEM_REQ);
+        # typed-parent index replaces the per-parent type filter
+        valid_parents = (
+            up_by_type.get((hlr_id, 'SYSTEM_REQ_DECOMPOSED'), ())
+            + up_by_type.get((hlr_id, 'SYSTEM_REQ'), ())
+        )
         
         # Check for LLR children
         llr_children = _get_children_of_type(hlr_id, 'LLR', graph, artifacts)
@@ -287,17 +325,19 @@ def _analyze_low_level_requirements(
     Note: LLRs are the leaf nodes, so we only check if they're mapped to HLRs.
     """
     
-    llrs = [a for a in artifacts.values() if a['type'] == 'LLR']
-    
+    llrs = graph['by_type'].get('LLR', [])
+
+    # Hoist hot lookups out of the loop
+    up_by_type = graph['edges_up_by_type']
+
     traced = []
     orphaned = []
-    
+
     for llr in llrs:
         llr_id = llr['id']
-        
-        # Check for HLR parent
-        parents = graph['edges_up'].get(llr_id, [])
-        hlr_parents = [p for p in parents if artifacts[p]['type'] == 'HLR']
+
+        # Check for HLR parent via the typed-parent index
+        hlr_parents = up_by_type.get((llr_id, 'HLR'), ())
         
         if hlr_parents:
             traced.append({
@@ -331,54 +371,97 @@ def _analyze_low_level_requirements(
 
 def _build_all_trace_paths(
     artifacts: Dict[str, Any],
-    graph: Dict[str, Any]
+    graph: Dict[str, Any],
+    lazy_paths: bool = False
 ) -> Dict[str, Any]:
     """
     Build complete trace paths for all requirements.
-    
+
     Returns paths for:
     - System requirements (forward trace: SYS → DECOMP → HLR → LLR)
     - High-level requirements (backward: HLR → DECOMP → SYS; forward: HLR → LLR)
     - Low-level requirements (backward trace: LLR → HLR → DECOMP → SYS)
+
+    With lazy_paths=True only path counts are computed (an O(V+E) DP,
+    no path materialization) — for consumers that never read the path
+    lists. Path counts can be exponential in graph depth, so skipping
+    materialization matters on heavily branched graphs. The default
+    keeps the full lists that trace_paths.json serializes.
     """
-    
+
+    if lazy_paths:
+        counts_down = _count_paths_down(graph)
+        counts_up = _count_paths_up(graph)
+
+        sys_paths = {}
+        for sys_req in graph['by_type'].get('SYSTEM_REQ', []):
+            sys_paths[sys_req['id']] = {
+                'id': sys_req['id'],
+                'text': sys_req['text'],
+                'path_count': counts_down.get(sys_req['id'], 1)
+            }
+        hlr_paths = {}
+        for hlr in graph['by_type'].get('HLR', []):
+            hlr_paths[hlr['id']] = {
+                'id': hlr['id'],
+                'text': hlr['text'],
+                'backward_path_count': counts_up.get(hlr['id'], 1),
+                'forward_path_count': counts_down.get(hlr['id'], 1)
+            }
+        llr_paths = {}
+        for llr in graph['by_type'].get('LLR', []):
+            llr_paths[llr['id']] = {
+                'id': llr['id'],
+                'text': llr['text'],
+                'backward_path_count': counts_up.get(llr['id'], 1)
+            }
+        return {
+            'system_requirements': sys_paths,
+            'high_level_requirements': hlr_paths,
+            'low_level_requirements': llr_paths
+        }
+
+    # One topological DP per direction replaces the old recursive traces,
+    # which copied the visited set per step and re-enumerated every shared
+    # subtree from each caller (exponential on diamond-shaped graphs).
+    # After the DP, each requirement's paths are a single dict read.
+    paths_down = _compute_paths_down(graph)
+    paths_up = _compute_paths_up(graph)
+
     sys_paths = {}
     hlr_paths = {}
     llr_paths = {}
-    
+
     # System requirement paths (forward)
-    sys_reqs = [a for a in artifacts.values() if a['type'] == 'SYSTEM_REQ']
+    sys_reqs = graph['by_type'].get('SYSTEM_REQ', [])
     for sys_req in sys_reqs:
-        paths = _trace_forward(sys_req['id'], graph, artifacts)
+        paths = paths_down.get(sys_req['id'], [[sys_req['id']]])
         sys_paths[sys_req['id']] = {
             'id': sys_req['id'],
             'text': sys_req['text'],
             'forward_paths': paths,
             'path_count': len(paths)
         }
-    
+
     # HLR paths (both directions)
-    hlrs = [a for a in artifacts.values() if a['type'] == 'HLR']
+    hlrs = graph['by_type'].get('HLR', [])
     for hlr in hlrs:
-        forward = _trace_forward(hlr['id'], graph, artifacts)
-        backward = _trace_backward(hlr['id'], graph, artifacts)
         hlr_paths[hlr['id']] = {
             'id': hlr['id'],
             'text': hlr['text'],
-            'backward_paths': backward,
-            'forward_paths': forward
+            'backward_paths': paths_up.get(hlr['id'], [[hlr['id']]]),
+            'forward_paths': paths_down.get(hlr['id'], [[hlr['id']]])
         }
-    
+
     # LLR paths (backward)
-    llrs = [a for a in artifacts.values() if a['type'] == 'LLR']
+    llrs = graph['by_type'].get('LLR', [])
     for llr in llrs:
-        backward = _trace_backward(llr['id'], graph, artifacts)
         llr_paths[llr['id']] = {
             'id': llr['id'],
             'text': llr['text'],
-            'backward_paths': backward
+            'backward_paths': paths_up.get(llr['id'], [[llr['id']]])
         }
-    
+
     return {
         'system_requirements': sys_paths,
         'high_level_requirements': hlr_paths,
@@ -386,62 +469,136 @@ def _build_all_trace_paths(
     }
 
 
-def _trace_forward(
-    start_id: str,
-    graph: Dict[str, Any],
-    artifacts: Dict[str, Any],
-    visited: set = None
-) -> List[List[str]]:
-    """Trace forward from a node to find all downstream paths."""
-    
-    if visited is None:
-        visited = set()
-    
-    if start_id in visited:
-        return []
-    
-    visited.add(start_id)
-    children = graph['edges_down'].get(start_id, [])
-    
-    if not children:
-        return [[start_id]]
-    
-    all_paths = []
-    for child in children:
-        child_paths = _trace_forward(child, graph, artifacts, visited.copy())
-        for path in child_paths:
-            all_paths.append([start_id] + path)
-    
-    return all_paths
+def _graph_node_universe(graph: Dict[str, Any]) -> set:
+    """All node IDs reachable through edges, including link endpoints
+    that are missing from the artifact dict."""
+    nodes = set(graph['artifacts'])
+    for parent, children in graph['edges_down'].items():
+        nodes.add(parent)
+        nodes.update(children)
+    return nodes
 
 
-def _trace_backward(
-    start_id: str,
-    graph: Dict[str, Any],
-    artifacts: Dict[str, Any],
-    visited: set = None
-) -> List[List[str]]:
-    """Trace backward from a node to find all upstream paths."""
-    
-    if visited is None:
-        visited = set()
-    
-    if start_id in visited:
-        return []
-    
-    visited.add(start_id)
-    parents = graph['edges_up'].get(start_id, [])
-    
-    if not parents:
-        return [[start_id]]
-    
-    all_paths = []
-    for parent in parents:
-        parent_paths = _trace_backward(parent, graph, artifacts, visited.copy())
-        for path in parent_paths:
-            all_paths.append(path + [start_id])
-    
-    return all_paths
+def _count_paths_down(graph: Dict[str, Any]) -> Dict[str, int]:
+    """Count downstream leaf-terminated paths per node in O(V+E).
+
+    Same Kahn order as _compute_paths_down, but carrying only
+    counts[n] = sum over children (sinks count 1), so nothing is
+    materialized.
+    """
+    edges_down = graph['edges_down']
+    edges_up = graph['edges_up']
+
+    nodes = _graph_node_universe(graph)
+    remaining = {n: len(edges_down.get(n, ())) for n in nodes}
+    queue = deque(n for n, r in remaining.items() if r == 0)
+    counts = {}
+
+    while queue:
+        node = queue.popleft()
+        children = edges_down.get(node, ())
+        counts[node] = sum(counts.get(c, 1) for c in children) if children else 1
+        for parent in edges_up.get(node, ()):
+            remaining[parent] -= 1
+            if remaining[parent] == 0:
+                queue.append(parent)
+
+    for node in nodes:
+        counts.setdefault(node, 1)
+    return counts
+
+
+def _count_paths_up(graph: Dict[str, Any]) -> Dict[str, int]:
+    """Symmetric upstream path-count DP: roots seed 1, children sum."""
+    edges_down = graph['edges_down']
+    edges_up = graph['edges_up']
+
+    nodes = _graph_node_universe(graph)
+    remaining = {n: len(edges_up.get(n, ())) for n in nodes}
+    queue = deque(n for n, r in remaining.items() if r == 0)
+    counts = {}
+
+    while queue:
+        node = queue.popleft()
+        parents = edges_up.get(node, ())
+        counts[node] = sum(counts.get(p, 1) for p in parents) if parents else 1
+        for child in edges_down.get(node, ()):
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                queue.append(child)
+
+    for node in nodes:
+        counts.setdefault(node, 1)
+    return counts
+
+
+def _compute_paths_down(graph: Dict[str, Any]) -> Dict[str, List[List[str]]]:
+    """Compute every downstream path for every node with one Kahn pass.
+
+    Leaves resolve to their singleton path; each node then prepends
+    itself to its children's already-computed paths, so shared subtrees
+    are enumerated exactly once. Nodes caught in a cycle never reach
+    zero remaining children and keep a singleton fallback.
+    """
+    edges_down = graph['edges_down']
+    edges_up = graph['edges_up']
+
+    nodes = _graph_node_universe(graph)
+    remaining = {n: len(edges_down.get(n, ())) for n in nodes}
+    queue = deque(n for n, r in remaining.items() if r == 0)
+    paths = {}
+
+    while queue:
+        node = queue.popleft()
+        children = edges_down.get(node, ())
+        if children:
+            paths[node] = [
+                [node] + path
+                for child in children
+                for path in paths.get(child, [[child]])
+            ]
+        else:
+            paths[node] = [[node]]
+        for parent in edges_up.get(node, ()):
+            remaining[parent] -= 1
+            if remaining[parent] == 0:
+                queue.append(parent)
+
+    for node in nodes:
+        paths.setdefault(node, [[node]])
+    return paths
+
+
+def _compute_paths_up(graph: Dict[str, Any]) -> Dict[str, List[List[str]]]:
+    """Symmetric upstream DP: roots first, each node appends itself to
+    its parents' paths."""
+    edges_down = graph['edges_down']
+    edges_up = graph['edges_up']
+
+    nodes = _graph_node_universe(graph)
+    remaining = {n: len(edges_up.get(n, ())) for n in nodes}
+    queue = deque(n for n, r in remaining.items() if r == 0)
+    paths = {}
+
+    while queue:
+        node = queue.popleft()
+        parents = edges_up.get(node, ())
+        if parents:
+            paths[node] = [
+                path + [node]
+                for parent in parents
+                for path in paths.get(parent, [[parent]])
+            ]
+        else:
+            paths[node] = [[node]]
+        for child in edges_down.get(node, ()):
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                queue.append(child)
+
+    for node in nodes:
+        paths.setdefault(node, [[node]])
+    return paths
 
 
 def _calculate_quality_metrics(
@@ -486,6 +643,5 @@ def _get_children_of_type(
     artifacts: Dict[str, Any]
 ) -> List[str]:
     """Get all children of a specific type for a parent node."""
-    
-    children = graph['edges_down'].get(parent_id, [])
-    return [c for c in children if artifacts[c]['type'] == child_type]
+
+    return graph['edges_down_by_type'].get((parent_id, child_type), ())
@@ -1,12 +1,38 @@
 """LLM-based requirement decomposition with rate limiting."""
 
+import copy
+import hashlib
 import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 from groq import Groq
 from src.decompose.prompts import DECOMPOSITION_SYSTEM_PROMPT, DECOMPOSITION_USER_PROMPT
 from src.utils.text_utils import extract_keywords, extract_quantities
 from src.utils.api_utils import rate_limiter, api_tracker
 
+# Precompiled so complexity detection scans each text once per pattern
+# instead of one substring pass per keyword
+_CONJ_RE = re.compile(r' (?:and|or) ')
+_COND_RE = re.compile(r'\b(?:when|upon|if|under|during|while)\b')
+
+# Decomposition is idempotent for identical (id, text, category), so
+# cache LLM results for the process lifetime — re-running a stage in the
+# same session costs zero API calls for unchanged requirements. Follows
+# the module-level cache pattern used for the embedding model.
+_DECOMPOSITION_CACHE: Dict[tuple, List[Dict[str, Any]]] = {}
+_DECOMPOSITION_CACHE_LOCK = threading.Lock()
+
+
+def _decomposition_cache_key(requirement: Dict[str, Any]) -> tuple:
+    """Cache key for a requirement: ID, text digest, and category."""
+    return (
+        requirement['id'],
+        hashlib.sha256(requirement['text'].encode()).hexdigest(),
+        requirement.get('metadata', {}).get('category', 'General')
+    )
+
 
 def detect_complex_requirement(requirement: Dict[str, Any]) -> bool:
     """
@@ -21,18 +47,16 @@ def detect_complex_requirement(requirement: Dict[str, Any]) -> bool:
     text = requirement['text'].lower()
     
     # Check for conjunctions
-    if ' and ' in text or ' or ' in text:
+    if _CONJ_RE.search(text):
         return True
-    
+
     # Check for multiple quantities
     quantities = requirement['extracted'].get('quantities', [])
     if len(quantities) > 1:
         return True
-    
-    # Check for multiple conditions
-    condition_words = ['when', 'upon', 'if', 'under', 'during', 'while']
-    condition_count = sum(1 for word in condition_words if word in text)
-    if condition_count > 1:
+
+    # Check for multiple distinct condition words (whole words only)
+    if len(set(_COND_RE.findall(text))) > 1:
         return True
     
     # Check text length
@@ -75,6 +99,14 @@ def decompose_requirement(
         }
         return [child]
     
+    # Reuse a previous LLM decomposition of this exact requirement
+    cache_key = _decomposition_cache_key(requirement)
+    with _DECOMPOSITION_CACHE_LOCK:
+        cached = _DECOMPOSITION_CACHE.get(cache_key)
+    if cached is not None:
+        # Deep copy: callers attach and mutate these child artifacts
+        return copy.deepcopy(cached)
+
     # Build prompt
     user_prompt = DECOMPOSITION_USER_PROMPT.format(
         requirement_id=requirement['id'],
@@ -135,9 +167,14 @@ def decompose_requirement(
             }
             
             children.append(child)
-        
+
+        # Only successful API results are cached; error fallbacks should
+        # retry on the next attempt
+        with _DECOMPOSITION_CACHE_LOCK:
+            _DECOMPOSITION_CACHE[cache_key] = copy.deepcopy(children)
+
         return children
-        
+
     except Exception as e:
         print(f"Error decomposing {requirement['id']}: {e}")
         # Fallback: create single atomic version
@@ -168,28 +205,38 @@ def decompose_all_system_requirements(
     
     Returns updated artifacts dictionary with decomposed children added.
     """
-    updated_artifacts = artifacts.copy()
-    
     # Find all system requirements
     sys_reqs = [art for art in artifacts.values() if art['type'] == 'SYSTEM_REQ']
-    
+
     print(f"Decomposing {len(sys_reqs)} system requirements...")
-    
-    for sys_req in sys_reqs:
-        print(f"  Decomposing {sys_req['id']}...")
-        
-        # Decompose
-        children = decompose_requirement(sys_req, groq_client)
-        
-        # Add children to artifacts
-        for child in children:
-            updated_artifacts[child['id']] = child
-        
-        # Update parent's children list
-        child_ids = [child['id'] for child in children]
-        updated_artifacts[sys_req['id']]['children'] = child_ids
-        updated_artifacts[sys_req['id']]['decomposed'] = True
-        
-        print(f"    Created {len(children)} sub-requirements")
-    
-    return updated_artifacts
+
+    # Each decomposition is an independent network round-trip, so run
+    # them concurrently; the shared rate_limiter still paces the actual
+    # API calls. executor.map preserves input order, so the artifact
+    # dict is updated deterministically regardless of completion order.
+    new_children = {}
+    updated_parents = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = executor.map(
+            lambda sys_req: decompose_requirement(sys_req, groq_client),
+            sys_reqs
+        )
+
+        for sys_req, children in zip(sys_reqs, results):
+            for child in children:
+                new_children[child['id']] = child
+
+            # Replace the parent wholesale instead of mutating the caller's
+            # artifact in place through the shallow copy
+            updated_parents[sys_req['id']] = {
+                **sys_req,
+                'children': [child['id'] for child in children],
+                'decomposed': True
+            }
+
+            print(f"  Decomposed {sys_req['id']}: {len(children)} sub-requirements")
+
+    # Single merged construction: one resize to final size instead of an
+    # O(N) copy followed by per-child inserts. Parents keep their original
+    # position; children append at the end, as before.
+    return {**artifacts, **updated_parents, **new_children}
@@ -1,8 +1,15 @@
 """Hierarchical layer-by-layer linking with LLM reasoning."""
 
 from typing import Dict, List, Tuple, Any, Set
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+import hashlib
+import json
+import re
+import time
 import uuid
+import numpy as np
 from groq import Groq
 
 from src.link.linker import (
@@ -12,7 +19,8 @@ from src.link.linker import (
     compute_id_relationship_boost,
     compute_combined_score,
     generate_link_rationale,
-    create_link
+    create_link,
+    normalize_quantities
 )
 from src.utils.api_utils import rate_limit_decorator, api_tracker_decorator
 from config import Config
@@ -60,6 +68,154 @@ CRITICAL RULES:
 - Reject candidates that are merely semantically similar but don't implement
 """
 
+LLM_BATCH_SELECTION_SYSTEM_PROMPT = LLM_SELECTION_SYSTEM_PROMPT + """
+BATCH MODE:
+You will be given SEVERAL source requirements, each with its own candidate
+list. Analyze each source independently. Respond with VALID JSON only:
+{
+  "results": [
+    {
+      "source_id": "SYS-001-A",
+      "selected_targets": [...as above...],
+      "rejected_targets": [...as above...]
+    }
+  ]
+}
+Include one results entry per source, in the order given.
+"""
+
+# Sources packed into one LLM request; amortizes the fixed system-prompt
+# tokens and HTTP round-trip without making any single response too
+# large to parse reliably
+_LLM_BATCH_SIZE = 4
+
+# LLM verdicts for byte-identical source/candidate sets are reused
+# across runs; iterative re-runs on mostly-unchanged artifacts then skip
+# the whole HTTP round-trip. Entries expire so stale verdicts don't
+# outlive prompt or model changes indefinitely
+_LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Candidate text shown to the LLM is capped at this many characters;
+# prompt tokens drive both latency and rate-limit pressure, and the
+# selection decision rarely hinges on anything past the first sentence
+_CANDIDATE_TEXT_CHARS = 120
+
+# Schema-constrained decoding: malformed confidences ("0.nine") become
+# structurally impossible instead of being repaired after the fact
+_SELECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "selected_targets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "target_id": {"type": "string"},
+                    "reasoning": {"type": "string"},
+                    "confidence": {"type": "number", "minimum": 0, "maximum": 1}
+                },
+                "required": ["target_id", "reasoning", "confidence"],
+                "additionalProperties": False
+            }
+        },
+        "rejected_targets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "target_id": {"type": "string"},
+                    "reason": {"type": "string"}
+                },
+                "required": ["target_id", "reason"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["selected_targets", "rejected_targets"],
+    "additionalProperties": False
+}
+
+_BATCH_SELECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "source_id": {"type": "string"},
+                    **_SELECTION_SCHEMA["properties"]
+                },
+                "required": ["source_id", "selected_targets", "rejected_targets"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["results"],
+    "additionalProperties": False
+}
+
+_SELECTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "selection", "strict": True, "schema": _SELECTION_SCHEMA}
+}
+
+_BATCH_SELECTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "batch_selection", "strict": True, "schema": _BATCH_SELECTION_SCHEMA}
+}
+
+
+# Known LLM glitches: "0.nine" instead of "0.9", stray spaces after the
+# decimal point, and # comments inside the JSON
+_CONF_WORDS = {
+    'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
+    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9'
+}
+_CONF_RE = re.compile(r'"confidence"\s*:\s*(\d+)\.\s*(\w+)', re.IGNORECASE)
+_COMMENT_RE = re.compile(r'#[^\n]*')
+
+
+def _repair_confidence(match: 're.Match') -> str:
+    tail = match.group(2)
+    return f'"confidence": {match.group(1)}.{_CONF_WORDS.get(tail.lower(), tail)}'
+
+
+def _parse_llm_json(result: str) -> Dict[str, Any]:
+    """Parse LLM JSON output, repairing known glitches only when the
+    straight parse fails - well-formed responses pay no regex passes.
+
+    Raises json.JSONDecodeError if the repaired string still won't parse.
+    """
+    try:
+        return json.loads(result)
+    except json.JSONDecodeError:
+        repaired = _CONF_RE.sub(_repair_confidence, result)
+        repaired = _COMMENT_RE.sub('', repaired)
+        return json.loads(repaired)
+
+
+# Reasoning strings emitted by _fallback_selection; selections carrying
+# one of these are degraded results and must never be cached
+_FALLBACK_REASONS = frozenset({
+    'JSON parse failed, using multi-signal match',
+    'LLM unavailable, using multi-signal match',
+    'Missing from batch response, using multi-signal match',
+})
+
+
+def _fallback_selection(candidates: List[Dict[str, Any]], reason: str) -> List[Dict[str, Any]]:
+    """Top-3 multi-signal selection used when the LLM response is unusable."""
+    return [
+        {
+            'target_id': c['target_id'],
+            'confidence': c['score'],
+            'reasoning': reason,
+            'match_details': c['match_details']
+        }
+        for c in candidates[:3]
+    ]
+
 
 class HierarchicalLinker:
     """
@@ -86,7 +242,36 @@ class HierarchicalLinker:
         self.config = config
         self.groq_client = groq_client
         self.links = []
-        
+
+        # Each artifact's keyword set and normalized quantities are built
+        # once here; the same target is scored against many sources, so
+        # per-pair reconstruction in the hot loop would repeat this work
+        # thousands of times
+        self._kw_sets = {}
+        self._qty_norms = {}
+        self._text_previews = {}
+        for art_id, artifact in artifacts.items():
+            extracted = artifact.get('extracted') or {}
+            self._kw_sets[art_id] = frozenset(extracted.get('keywords', []))
+            self._qty_norms[art_id] = normalize_quantities(extracted.get('quantities', []))
+            self._text_previews[art_id] = ' '.join(
+                artifact.get('text', '').split()
+            )[:_CANDIDATE_TEXT_CHARS]
+
+        # Quality-filter thresholds are fixed for the linker's lifetime;
+        # resolving the config attribute chain and mapping lookups once
+        # keeps them out of the per-source scoring path
+        quality_filters = config.linking.quality_filters
+        self._min_text_overlap = quality_filters.get('min_text_overlap', 0.05)
+        self._min_signals = quality_filters.get('min_combined_signals', 2)
+
+        # Persistent LLM selection cache (content-hash keyed, JSON file).
+        # Anchored to cache_dir, not data_dir: the latter is repointed at
+        # a fresh run directory per invocation, which would orphan the
+        # cache and guarantee misses
+        self._selection_cache_path = Path(config.cache_dir) / 'llm_selections.json'
+        self._selection_cache = self._load_selection_cache()
+
         # Statistics
         self.stats = {
             'decomposition': 0,
@@ -186,25 +371,106 @@ class HierarchicalLinker:
         # Get all source artifacts
         sources = [a for a in self.artifacts.values() if a['type'] == source_type]
         print(f"  Processing {len(sources)} {source_type} artifacts...")
-        
+
+        # One pass over the corpus builds the target pool for the whole
+        # layer, so the per-candidate loop stops re-checking types
+        target_pool = {
+            a['id']: a for a in self.artifacts.values() if a['type'] == target_type
+        }
+
+        # Phase 1: candidate generation. One batched FAISS query covers
+        # every source in the layer, amortizing the index traversal that
+        # per-source search_similar calls would repeat N times; sources
+        # without an embedding are skipped up front
+        emb_sources = []
+        embeddings = []
         for source in sources:
-            # Find candidates using multi-signal matching
+            embedding = self.indexer.get_embedding(source['id'])
+            if embedding is None:
+                continue
+            emb_sources.append(source)
+            embeddings.append(embedding)
+
+        similar_lists = []
+        if embeddings:
+            similar_lists = self.indexer.search_similar_batch(
+                query_embeddings=np.stack(embeddings),
+                top_k=40,  # matches _find_candidates' top_k * 2 over-fetch
+                threshold=self.config.linking.embedding_threshold
+            )
+
+        source_candidates = []
+        for source, similar in zip(emb_sources, similar_lists):
+            # Score candidates using multi-signal matching
             candidates = self._find_candidates(
                 source,
                 target_type,
-                threshold=threshold * 0.7  # Lower threshold for candidate generation
+                threshold=threshold * 0.7,  # Lower threshold for candidate generation
+                target_pool=target_pool,
+                similar=similar
             )
-            
+
             self.stats[layer_name]['candidates'] += len(candidates)
-            
-            if not candidates:
-                continue
-            
-            # Use LLM to select best matches if enabled
-            if use_llm and self.groq_client and len(candidates) > 1:
-                selected = self._llm_select_targets(source, candidates, layer_name)
-                self.stats[layer_name]['llm_calls'] += 1
-            else:
+
+            if candidates:
+                source_candidates.append((source, candidates))
+
+        # Phase 2: LLM selection. Each request is a blocking HTTP
+        # round-trip, so pack sources into batches (amortizing the fixed
+        # system prompt) and dispatch the batches concurrently; the
+        # rate-limit decorator still spaces requests across threads
+        llm_selections = {}
+        use_llm = use_llm and self.groq_client is not None
+        if use_llm:
+            # Cached verdicts from earlier runs short-circuit here; only
+            # source/candidate sets the cache has never seen go to the LLM
+            to_llm = []
+            cache_keys = {}
+            for s, c in source_candidates:
+                if len(c) <= 1:
+                    continue
+                key = self._selection_cache_key(s, c)
+                entry = self._selection_cache.get(key)
+                if entry is not None:
+                    llm_selections[s['id']] = entry['selected']
+                    continue
+                cache_keys[s['id']] = key
+                to_llm.append((s, c))
+
+            batches = [
+                to_llm[i:i + _LLM_BATCH_SIZE]
+                for i in range(0, len(to_llm), _LLM_BATCH_SIZE)
+            ]
+            self.stats[layer_name]['llm_calls'] += len(batches)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [
+                    executor.submit(self._llm_select_targets_batch, b, layer_name)
+                    for b in batches
+                ]
+                for future in futures:
+                    llm_selections.update(future.result())
+
+            # Write-through: persist genuine LLM verdicts, never fallbacks
+            fresh = False
+            for s, _ in to_llm:
+                selected = llm_selections.get(s['id'])
+                if selected is None or any(
+                    sel.get('reasoning') in _FALLBACK_REASONS for sel in selected
+                ):
+                    continue
+                self._selection_cache[cache_keys[s['id']]] = {
+                    'timestamp': time.time(),
+                    'selected': selected
+                }
+                fresh = True
+            if fresh:
+                self._save_selection_cache()
+
+        # Phase 3: collect selections and create links in source order,
+        # so link output is deterministic regardless of completion order
+        for source, candidates in source_candidates:
+            selected = llm_selections.get(source['id'])
+            if selected is None:
                 # No LLM: accept all candidates above threshold
                 selected = [
                     {
@@ -215,7 +481,7 @@ class HierarchicalLinker:
                     }
                     for c in candidates
                 ]
-            
+
             # Create links for selected targets
             for sel in selected:
                 target = self.artifacts[sel['target_id']]
@@ -237,130 +503,210 @@ class HierarchicalLinker:
                 )
                 self.links.append(link)
                 self.stats[layer_name]['selected'] += 1
-        
+
         print(f"  Created {self.stats[layer_name]['selected']} links")
     
+    def _load_selection_cache(self) -> Dict[str, Any]:
+        """Load the persisted LLM selection cache, dropping expired entries."""
+        try:
+            with open(self._selection_cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+        cutoff = time.time() - _LLM_CACHE_TTL_SECONDS
+        return {k: v for k, v in cache.items() if v.get('timestamp', 0) >= cutoff}
+
+    def _save_selection_cache(self) -> None:
+        """Persist the LLM selection cache to disk."""
+        self._selection_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._selection_cache_path, 'w') as f:
+            json.dump(self._selection_cache, f)
+
+    def _selection_cache_key(
+        self,
+        source: Dict[str, Any],
+        candidates: List[Dict[str, Any]]
+    ) -> str:
+        """Content hash over everything the LLM verdict depends on.
+
+        Any edit to the source text, a candidate text, a candidate score
+        or the configured model produces a new key, so stale verdicts are
+        never replayed against changed inputs.
+        """
+        parts = [source['text']]
+        parts.extend(
+            f"{c['target_id']}:{c['score']:.3f}:{self.artifacts[c['target_id']]['text']}"
+            for c in candidates[:10]
+        )
+        parts.append(self.config.groq.model)
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
     def _find_candidates(
         self,
         source: Dict[str, Any],
         target_type: str,
         threshold: float = 0.2,
-        top_k: int = 20
+        top_k: int = 20,
+        target_pool: Dict[str, Any] = None,
+        similar: List[Tuple[str, float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find candidate targets using multi-signal matching.
-        
+
+        target_pool, when provided, is the precomputed id -> artifact map
+        for target_type; one membership test then replaces the per-hit
+        artifact lookup and type compare. similar, when provided, is this
+        source's slice of a batched ANN query; otherwise a per-source
+        search runs here.
+
         Returns: List of candidate dicts with scores and details
         """
         source_id = source['id']
-        
-        # Get embedding similarity candidates
-        embedding = self.indexer.get_embedding(source_id)
-        if embedding is None:
-            return []
-        
-        similar = self.indexer.search_similar(
-            query_embedding=embedding,
-            top_k=top_k * 2,
-            threshold=self.config.linking.embedding_threshold
-        )
-        
-        candidates = []
+
+        if target_pool is None:
+            target_pool = {
+                a['id']: a for a in self.artifacts.values() if a['type'] == target_type
+            }
+
+        if similar is None:
+            # Get embedding similarity candidates
+            embedding = self.indexer.get_embedding(source_id)
+            if embedding is None:
+                return []
+
+            similar = self.indexer.search_similar(
+                query_embedding=embedding,
+                top_k=top_k * 2,
+                threshold=self.config.linking.embedding_threshold
+            )
+
+        # Per-pair signals are set/string operations that also produce the
+        # detail lists shown in prompts, so they stay in the loop; the
+        # combine/filter/top-k stage below runs vectorized over columns
+        is_var_layer = source['type'] == 'LLR' and target_type == 'CODE_VAR'
+        hit_ids = []
+        emb_col = []
+        kw_col = []
+        qm_col = []
+        nm_col = []
+        idb_col = []
+        detail_cols = []
         for target_id, emb_sim in similar:
-            target = self.artifacts.get(target_id)
-            if not target or target['type'] != target_type:
+            target = target_pool.get(target_id)
+            if target is None:
                 continue
-            
-            # Compute all match signals
-            keyword_score, keywords = compute_keyword_score(source, target)
-            quantity_match, quantities = compute_quantity_match(source, target)
-            
+
+            # Compute all match signals, reusing the precomputed per-
+            # artifact keyword sets and normalized quantities
+            keyword_score, keywords = compute_keyword_score(
+                source, target,
+                self._kw_sets.get(source_id), self._kw_sets.get(target_id)
+            )
+            quantity_match, quantities = compute_quantity_match(
+                source, target,
+                self._qty_norms.get(source_id), self._qty_norms.get(target_id)
+            )
+
             # Variable name matching (only for LLR -> VAR)
             name_score = 0.0
-            if source['type'] == 'LLR' and target['type'] == 'CODE_VAR':
+            if is_var_layer:
                 name_score, _ = compute_variable_name_match(source, target)
-            
+
             # ID hierarchy boost
             id_boost = compute_id_relationship_boost(source_id, target_id)
-            
-            # Compute combined score
-            combined_score = compute_combined_score(
-                embedding_sim=emb_sim,
-                keyword_score=keyword_score,
-                quantity_match=quantity_match,
-                name_match_score=name_score,
-                id_boost=id_boost
-            )
-            
-            # Apply quality filters
-            if not self._passes_quality_filters(combined_score, emb_sim, keyword_score, 
-                                                  quantity_match, name_score, id_boost):
-                continue
-            
-            if combined_score >= threshold:
-                candidates.append({
-                    'target_id': target_id,
-                    'score': combined_score,
-                    'match_details': {
-                        'embedding_similarity': emb_sim,
-                        'keyword_score': keyword_score,
-                        'keyword_overlap': keywords,
-                        'quantity_match': quantity_match,
-                        'quantities_matched': quantities,
-                        'name_match_score': name_score,
-                        'id_boost': id_boost,
-                        'combined_score': combined_score
-                    }
-                })
-        
-        # Sort by score and limit
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-        return candidates[:top_k]
-    
-    def _passes_quality_filters(
+
+            hit_ids.append(target_id)
+            emb_col.append(emb_sim)
+            kw_col.append(keyword_score)
+            qm_col.append(quantity_match)
+            nm_col.append(name_score)
+            idb_col.append(id_boost)
+            detail_cols.append((keywords, quantities))
+
+        if not hit_ids:
+            return []
+
+        # float64 so the reported scores round-trip exactly like the old
+        # scalar arithmetic did
+        emb = np.asarray(emb_col, dtype=np.float64)
+        kw = np.asarray(kw_col, dtype=np.float64)
+        qm = np.asarray(qm_col, dtype=bool)
+        nm = np.asarray(nm_col, dtype=np.float64)
+        idb = np.asarray(idb_col, dtype=np.float64)
+
+        # Same default weights as compute_combined_score, as one
+        # expression over all candidates
+        combined = np.minimum(
+            1.0, 0.45 * emb + 0.25 * kw + 0.15 * qm + 0.15 * nm + idb
+        )
+
+        mask = self._quality_filter_mask(combined, emb, kw, qm, nm, idb)
+        mask &= combined >= threshold
+        keep = np.flatnonzero(mask)
+
+        # argpartition pulls the top_k without sorting the full column
+        if len(keep) > top_k:
+            keep = keep[np.argpartition(-combined[keep], top_k)[:top_k]]
+        keep = keep[np.argsort(-combined[keep], kind='stable')]
+
+        candidates = []
+        for i in keep:
+            keywords, quantities = detail_cols[i]
+            combined_score = float(combined[i])
+            candidates.append({
+                'target_id': hit_ids[i],
+                'score': combined_score,
+                'match_details': {
+                    'embedding_similarity': float(emb[i]),
+                    'keyword_score': float(kw[i]),
+                    'keyword_overlap': keywords,
+                    'quantity_match': bool(qm[i]),
+                    'quantities_matched': quantities,
+                    'name_match_score': float(nm[i]),
+                    'id_boost': float(idb[i]),
+                    'combined_score': combined_score
+                }
+            })
+
+        return candidates
+
+    def _quality_filter_mask(
         self,
-        combined_score: float,
-        emb_sim: float,
-        keyword_score: float,
-        quantity_match: bool,
-        name_score: float,
-        id_boost: float
-    ) -> bool:
+        combined: np.ndarray,
+        emb: np.ndarray,
+        kw: np.ndarray,
+        qm: np.ndarray,
+        nm: np.ndarray,
+        idb: np.ndarray
+    ) -> np.ndarray:
         """
-        Apply quality filters to prevent false positives.
-        
-        Returns: True if candidate passes quality checks
+        Quality filters to prevent false positives, as one boolean mask
+        over all candidates of a source.
+
+        Returns: Mask of candidates passing quality checks
         """
-        filters = self.config.linking.quality_filters
-        
-        # Minimum overall score
-        if combined_score < filters.get('min_text_overlap', 0.05):
-            return False
-        
         # Strong signal check
         has_strong_signal = (
-            keyword_score > 0.20 or
-            emb_sim > 0.30 or
-            (emb_sim > 0.20 and keyword_score > 0.12)
+            (kw > 0.20) |
+            (emb > 0.30) |
+            ((emb > 0.20) & (kw > 0.12))
         )
-        
-        if has_strong_signal:
-            return True
-        
+
         # Multiple moderate signals (need at least 2)
-        signal_count = 0
-        if emb_sim > 0.12:
-            signal_count += 1
-        if keyword_score > 0.05:
-            signal_count += 1
-        if quantity_match:
-            signal_count += 1
-        if name_score > 0.10:
-            signal_count += 1
-        if id_boost > 0.05:
-            signal_count += 1
-        
-        return signal_count >= filters.get('min_combined_signals', 2)
+        signal_count = (
+            (emb > 0.12).astype(np.int8) +
+            (kw > 0.05) +
+            qm +
+            (nm > 0.10) +
+            (idb > 0.05)
+        )
+
+        # Minimum overall score
+        return (combined >= self._min_text_overlap) & (
+            has_strong_signal |
+            (signal_count >= self._min_signals)
+        )
     
     @rate_limit_decorator(max_calls_per_minute=30)
     @api_tracker_decorator()
@@ -389,88 +735,126 @@ class HierarchicalLinker:
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.1,
-                response_format={"type": "json_object"}
+                response_format=_SELECTION_RESPONSE_FORMAT
             )
             
             result = response.choices[0].message.content
-            
-            # Clean up common JSON formatting issues
-            import json
-            import re
-            
-            # Fix common issues like "0.nine" -> "0.9"
-            result = re.sub(r'"confidence":\s*0\.\s*nine', '"confidence": 0.9', result, flags=re.IGNORECASE)
-            result = re.sub(r'"confidence":\s*0\.\s*eight', '"confidence": 0.8', result, flags=re.IGNORECASE)
-            result = re.sub(r'"confidence":\s*0\.\s*seven', '"confidence": 0.7', result, flags=re.IGNORECASE)
-            result = re.sub(r'"confidence":\s*0\.\s*six', '"confidence": 0.6', result, flags=re.IGNORECASE)
-            result = re.sub(r'"confidence":\s*(\d+)\.\s*(\w+)', r'"confidence": \1.\2', result)  # Fix space after decimal
-            
-            # Remove any comments (# ...) from JSON
-            result = re.sub(r'#[^\n]*', '', result)
-            
+
             try:
-                parsed = json.loads(result)
+                parsed = _parse_llm_json(result)
             except json.JSONDecodeError as je:
                 print(f"  JSON parse error: {je}")
                 print(f"  Problematic JSON: {result[:500]}")
                 # Fallback to top 3 candidates
-                return [
-                    {
-                        'target_id': c['target_id'],
-                        'confidence': c['score'],
-                        'reasoning': 'JSON parse failed, using multi-signal match',
-                        'match_details': c['match_details']
-                    }
-                    for c in candidates[:3]
-                ]
-            
-            # Extract selected targets
-            selected = parsed.get('selected_targets', [])
-            
-            # Validate and filter by confidence
-            valid_selected = []
-            for sel in selected:
-                # Handle confidence as string or number
-                try:
-                    confidence = float(sel['confidence'])
-                except (ValueError, TypeError):
-                    print(f"  Warning: Invalid confidence value for {sel.get('target_id')}: {sel.get('confidence')}")
-                    continue
-                
-                if confidence >= 0.6:  # Minimum LLM confidence
-                    # Find original candidate to get match details
-                    for cand in candidates:
-                        if cand['target_id'] == sel['target_id']:
-                            valid_selected.append({
-                                'target_id': sel['target_id'],
-                                'confidence': confidence,
-                                'reasoning': sel['reasoning'],
-                                'match_details': cand['match_details']
-                            })
-                            break
-            
-            return valid_selected
-            
+                return _fallback_selection(candidates, 'JSON parse failed, using multi-signal match')
+
+            # Extract selected targets, validate and filter by confidence
+            return self._validate_selected(parsed.get('selected_targets', []), candidates)
+
         except Exception as e:
             print(f"  LLM selection failed: {e}")
             # Fallback: return top 3 candidates
-            return [
-                {
-                    'target_id': c['target_id'],
-                    'confidence': c['score'],
-                    'reasoning': 'LLM unavailable, using multi-signal match',
-                    'match_details': c['match_details']
-                }
-                for c in candidates[:3]
-            ]
+            return _fallback_selection(candidates, 'LLM unavailable, using multi-signal match')
+
+    def _validate_selected(
+        self,
+        selected: List[Dict[str, Any]],
+        candidates: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Validate LLM-selected targets against the original candidates."""
+        cand_by_id = {c['target_id']: c for c in candidates}
+
+        valid_selected = []
+        for sel in selected:
+            # Handle confidence as string or number
+            try:
+                confidence = float(sel['confidence'])
+            except (ValueError, TypeError, KeyError):
+                print(f"  Warning: Invalid confidence value for {sel.get('target_id')}: {sel.get('confidence')}")
+                continue
+
+            if confidence >= 0.6:  # Minimum LLM confidence
+                # Look up original candidate to get match details
+                cand = cand_by_id.get(sel['target_id'])
+                if cand is None:
+                    continue
+                valid_selected.append({
+                    'target_id': sel['target_id'],
+                    'confidence': confidence,
+                    'reasoning': sel.get('reasoning', ''),
+                    'match_details': cand['match_details']
+                })
+
+        return valid_selected
+
+    @rate_limit_decorator(max_calls_per_minute=30)
+    @api_tracker_decorator()
+    def _llm_select_targets_batch(
+        self,
+        batch: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+        layer_name: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run LLM selection for several sources in one request.
+
+        Packing sources amortizes the fixed system-prompt tokens and the
+        HTTP round-trip across the batch.
+
+        Returns: Mapping of source_id -> selected targets with reasoning
+        """
+        candidates_by_source = {
+            source['id']: candidates[:10] for source, candidates in batch
+        }
+
+        user_prompt = self._build_batch_selection_prompt(batch)
+
+        try:
+            response = self.groq_client.chat.completions.create(
+                model=self.config.groq.model,
+                messages=[
+                    {"role": "system", "content": LLM_BATCH_SELECTION_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1,
+                response_format=_BATCH_SELECTION_RESPONSE_FORMAT
+            )
+
+            parsed = _parse_llm_json(response.choices[0].message.content)
+
+            selections = {}
+            for entry in parsed.get('results', []):
+                source_id = entry.get('source_id')
+                candidates = candidates_by_source.get(source_id)
+                if candidates is None:
+                    continue
+                selections[source_id] = self._validate_selected(
+                    entry.get('selected_targets', []), candidates
+                )
+
+            # Sources the response skipped fall back to multi-signal
+            for source_id, candidates in candidates_by_source.items():
+                if source_id not in selections:
+                    selections[source_id] = _fallback_selection(
+                        candidates, 'Missing from batch response, using multi-signal match'
+                    )
+
+            return selections
+
+        except Exception as e:
+            print(f"  Batch LLM selection failed: {e}")
+            return {
+                source_id: _fallback_selection(candidates, 'LLM unavailable, using multi-signal match')
+                for source_id, candidates in candidates_by_source.items()
+            }
     
     def _build_selection_prompt(
         self,
         source: Dict[str, Any],
-        candidates: List[Dict[str, Any]]
+        candidates: List[Dict[str, Any]],
+        include_footer: bool = True
     ) -> str:
         """Build LLM prompt for target selection."""
-        
+
         prompt = f"""SOURCE REQUIREMENT:
 ID: {source['id']}
 Type: {source['type']}
@@ -480,27 +864,44 @@ CANDIDATE TARGETS (scored by multi-signal matching):
 
 """
         
+        # Lean per-candidate block: ID, combined score, trimmed text and a
+        # few shared keywords. The individual signal floats are already
+        # folded into the score and only inflate the token count
         for i, cand in enumerate(candidates, 1):
-            target = self.artifacts[cand['target_id']]
-            details = cand['match_details']
-            
+            preview = self._text_previews.get(cand['target_id'], '')
+            keywords = ', '.join(cand['match_details']['keyword_overlap'][:3])
+
             prompt += f"""{i}. {cand['target_id']} (Score: {cand['score']:.2f})
-   Text: {target['text'][:200]}...
-   Match Details:
-   - Embedding similarity: {details['embedding_similarity']:.2f}
-   - Keyword score: {details['keyword_score']:.2f}
-   - Keywords: {', '.join(details['keyword_overlap'][:5])}
-   - Quantities matched: {', '.join(details['quantities_matched'])}
-   - ID relationship boost: {details['id_boost']:.2f}
+   Text: {preview}
+   Keywords: {keywords}
 
 """
-        
-        prompt += """
+
+        if include_footer:
+            prompt += """
 Analyze these candidates and select which ones ACTUALLY implement the source requirement.
 Respond in JSON format as specified in the system prompt.
 """
-        
+
         return prompt
+
+    def _build_batch_selection_prompt(
+        self,
+        batch: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]
+    ) -> str:
+        """Build LLM prompt covering several sources in one request."""
+
+        parts = []
+        for k, (source, candidates) in enumerate(batch, 1):
+            parts.append(f"===== SOURCE {k} of {len(batch)} =====\n")
+            parts.append(self._build_selection_prompt(source, candidates[:10], include_footer=False))
+
+        parts.append("""
+For EACH source above, select which candidates ACTUALLY implement it.
+Respond in the batch JSON format specified in the system prompt.
+""")
+
+        return ''.join(parts)
     
     def _report_statistics(self) -> None:
         """Report linking statistics."""
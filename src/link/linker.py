@@ -1,7 +1,7 @@
 """Link scoring and creation with hierarchical linking support."""
 
 from typing import Dict, List, Tuple, Any, Set
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 import re
 
@@ -66,15 +66,25 @@ def compute_id_relationship_boost(source_id: str, target_id: str) -> float:
     return 0.0
 
 
-def compute_keyword_score(source: Dict[str, Any], target: Dict[str, Any]) -> Tuple[float, List[str]]:
+def compute_keyword_score(
+    source: Dict[str, Any],
+    target: Dict[str, Any],
+    source_keywords: Set[str] = None,
+    target_keywords: Set[str] = None
+) -> Tuple[float, List[str]]:
     """
     Compute keyword overlap score using Jaccard similarity.
     Enhanced to handle partial word matches.
-    
+
+    Callers scoring the same artifacts repeatedly can pass precomputed
+    keyword sets to skip the per-pair set construction.
+
     Returns: (score, matching_keywords)
     """
-    source_keywords = set(source.get('extracted', {}).get('keywords', []))
-    target_keywords = set(target.get('extracted', {}).get('keywords', []))
+    if source_keywords is None:
+        source_keywords = set(source.get('extracted', {}).get('keywords', []))
+    if target_keywords is None:
+        target_keywords = set(target.get('extracted', {}).get('keywords', []))
     
     if not source_keywords or not target_keywords:
         # Fallback to text-based keyword extraction
@@ -103,24 +113,46 @@ def compute_keyword_score(source: Dict[str, Any], target: Dict[str, Any]) -> Tup
     return score, matching
 
 
-def compute_quantity_match(source: Dict[str, Any], target: Dict[str, Any]) -> Tuple[bool, List[str]]:
+def normalize_quantities(quantities: List[Dict]) -> List[Tuple[Any, str, str]]:
+    """Precompute (value, normalized_unit, raw_unit) triples for matching."""
+    return [
+        (q.get('value'), normalize_unit(q.get('unit', '')), q.get('unit', ''))
+        for q in quantities
+    ]
+
+
+def compute_quantity_match(
+    source: Dict[str, Any],
+    target: Dict[str, Any],
+    source_quants_norm: List[Tuple[Any, str, str]] = None,
+    target_quants_norm: List[Tuple[Any, str, str]] = None
+) -> Tuple[bool, List[str]]:
     """
     Check if quantities match between artifacts.
-    
+
+    Precomputed normalize_quantities output can be passed in so the pair
+    loop skips re-normalizing every unit on every comparison.
+
     Returns: (match_bool, matched_quantities)
     """
-    source_quants = source.get('extracted', {}).get('quantities', [])
-    target_quants = target.get('extracted', {}).get('quantities', [])
-    
-    if not source_quants or not target_quants:
+    if source_quants_norm is None:
+        source_quants_norm = normalize_quantities(source.get('extracted', {}).get('quantities', []))
+    if target_quants_norm is None:
+        target_quants_norm = normalize_quantities(target.get('extracted', {}).get('quantities', []))
+
+    if not source_quants_norm or not target_quants_norm:
         return False, []
-    
+
     matched = []
-    for sq in source_quants:
-        for tq in target_quants:
-            if quantities_equal(sq, tq):
-                matched.append(f"{sq.get('value')} {sq.get('unit', '')}")
-    
+    for sv, su, s_raw_unit in source_quants_norm:
+        if isinstance(sv, str):
+            continue
+        for tv, tu, _ in target_quants_norm:
+            if isinstance(tv, str):
+                continue
+            if abs(sv - tv) <= 0.001 and su == tu:
+                matched.append(f"{sv} {s_raw_unit}")
+
     return len(matched) > 0, matched
 
 
@@ -295,7 +327,7 @@ def create_link(
         'status': 'confirmed' if confidence >= 0.7 else 'candidate',
         'match_details': match_details,
         'rationale': generate_link_rationale(source, target, match_details),
-        'created_at': datetime.utcnow().isoformat() + 'Z',
+        'created_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
         'created_by': 'auto'
     }
 
@@ -16,6 +16,7 @@ from src.analyze.hierarchical_analyzer import analyze_hierarchical_traceability
 from src.analyze.unified_analyzer import analyze_unified_traceability
 from src.analyze.reasoner import explain_all_gaps
 from src.utils.file_io import save_json, load_json, save_csv
+from src.utils.id_utils import intern_artifact_types
 from src.utils.api_utils import api_tracker
 from src.utils.visualization import generate_trace_graph_html, generate_trace_table_html
 from src.utils.graph_enhanced import generate_enhanced_trace_graph
@@ -119,8 +120,11 @@ class TraceabilityPipeline:
             
             # Load embeddings
             artifacts_data = load_json(str(self.intermediate_dir / "decomposed_artifacts.json"))
-            self.artifacts = artifacts_data['artifacts']
-            self.indexer.generate_all_embeddings(self.artifacts)
+            self.artifacts = intern_artifact_types(artifacts_data['artifacts'])
+            # The saved matrix loads memory-mapped with the index; only
+            # re-encode when it doesn't cover the current artifacts
+            if not self.indexer.has_embeddings_for(self.artifacts):
+                self.indexer.generate_all_embeddings(self.artifacts)
         
         if use_hierarchical:
             # Use new hierarchical linker with LLM reasoning
@@ -151,7 +155,7 @@ class TraceabilityPipeline:
         # Load data if needed
         if not self.artifacts:
             artifacts_data = load_json(str(self.intermediate_dir / "decomposed_artifacts.json"))
-            self.artifacts = artifacts_data['artifacts']
+            self.artifacts = intern_artifact_types(artifacts_data['artifacts'])
         
         if not self.links:
             links_data = load_json(str(self.intermediate_dir / "links.json"))
@@ -183,7 +187,7 @@ class TraceabilityPipeline:
         # Load data if needed
         if not self.artifacts:
             artifacts_data = load_json(str(self.intermediate_dir / "decomposed_artifacts.json"))
-            self.artifacts = artifacts_data['artifacts']
+            self.artifacts = intern_artifact_types(artifacts_data['artifacts'])
         
         if not self.links:
             links_data = load_json(str(self.intermediate_dir / "links.json"))
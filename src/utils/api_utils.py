@@ -1,5 +1,6 @@
 """API call tracker and rate limiter."""
 
+import threading
 import time
 from typing import Dict, Any, Callable
 from datetime import datetime
@@ -8,15 +9,16 @@ from pathlib import Path
 
 
 class APICallTracker:
-    """Track API calls and costs."""
-    
+    """Track API calls and costs. Safe to share across worker threads."""
+
     def __init__(self):
         self.calls = []
         self.total_calls = 0
         self.total_tokens_input = 0
         self.total_tokens_output = 0
         self.start_time = datetime.now()
-        
+        self._lock = threading.Lock()
+
     def log_call(self, model: str, purpose: str, tokens_input: int, tokens_output: int):
         """Log an API call."""
         call = {
@@ -27,10 +29,11 @@ class APICallTracker:
             'tokens_output': tokens_output,
             'tokens_total': tokens_input + tokens_output
         }
-        self.calls.append(call)
-        self.total_calls += 1
-        self.total_tokens_input += tokens_input
-        self.total_tokens_output += tokens_output
+        with self._lock:
+            self.calls.append(call)
+            self.total_calls += 1
+            self.total_tokens_input += tokens_input
+            self.total_tokens_output += tokens_output
         
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics."""
@@ -88,17 +91,23 @@ class RateLimiter:
         self.base_delay = base_delay
         self.last_call_time = 0
         self.min_interval = 0.1  # Minimum time between calls
-        
+        self._lock = threading.Lock()
+
     def wait_if_needed(self):
-        """Wait if needed to respect rate limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_call_time
-        
-        if time_since_last < self.min_interval:
-            wait_time = self.min_interval - time_since_last
-            time.sleep(wait_time)
-        
-        self.last_call_time = time.time()
+        """Wait if needed to respect rate limits.
+
+        The lock serializes the check-and-sleep so concurrent callers still
+        space their calls min_interval apart instead of racing past together.
+        """
+        with self._lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_call_time
+
+            if time_since_last < self.min_interval:
+                wait_time = self.min_interval - time_since_last
+                time.sleep(wait_time)
+
+            self.last_call_time = time.time()
     
     def call_with_retry(self, func: Callable, *args, **kwargs) -> Any:
         """
@@ -186,27 +195,31 @@ def rate_limit_decorator(max_calls_per_minute: int = 30):
     """
     import time
     from functools import wraps
-    
+
     min_interval = 60.0 / max_calls_per_minute
     last_call = {'time': 0.0}
-    
+    # Serialize the check-and-sleep so concurrent worker threads space
+    # their calls out instead of racing past the interval check together
+    lock = threading.Lock()
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Wait if needed
-            current_time = time.time()
-            time_since_last = current_time - last_call['time']
-            
-            if time_since_last < min_interval:
-                wait_time = min_interval - time_since_last
-                time.sleep(wait_time)
-            
-            # Update last call time
-            last_call['time'] = time.time()
-            
+            with lock:
+                # Wait if needed
+                current_time = time.time()
+                time_since_last = current_time - last_call['time']
+
+                if time_since_last < min_interval:
+                    wait_time = min_interval - time_since_last
+                    time.sleep(wait_time)
+
+                # Update last call time
+                last_call['time'] = time.time()
+
             # Call function
             return func(*args, **kwargs)
-        
+
         return wrapper
-    
+
     return decorator
@@ -1,7 +1,28 @@
 """ID parsing and hierarchy utilities."""
 
 import re
-from typing import Optional, Tuple, List
+import sys
+from typing import Optional, Tuple, List, Dict, Any
+
+
+# Canonical artifact type strings, interned so hot-path comparisons and
+# dict-key hashing hit CPython's pointer-identity fast path
+ARTIFACT_TYPES = tuple(sys.intern(t) for t in (
+    'SYSTEM_REQ', 'SYSTEM_REQ_DECOMPOSED', 'HLR', 'LLR', 'CODE_VAR'
+))
+
+
+def intern_artifact_types(artifacts: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-intern the 'type' field of artifacts loaded from JSON.
+
+    json.load produces fresh string objects, so every downstream
+    `artifact['type'] == 'HLR'` comparison falls back to a character
+    compare. Interning restores identity-based equality and cached
+    hashes for the type strings used as dict keys throughout analysis.
+    """
+    for artifact in artifacts.values():
+        artifact['type'] = sys.intern(artifact['type'])
+    return artifacts
 
 
 def parse_id(artifact_id: str) -> Tuple[str, List[str]]:
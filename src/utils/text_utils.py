@@ -34,60 +34,81 @@ STOPWORDS = {
     'these', 'those', 'it', 'its', 'when', 'where', 'which', 'who', 'how'
 }
 
+# Everything below is derived once at import; the extractors run per
+# CSV row, so per-call set rebuilds and regex compiles add up fast
+_ALL_DOMAIN_WORDS = {word for words in DOMAIN_KEYWORDS.values() for word in words}
+_DOMAIN_PHRASES = {word for word in _ALL_DOMAIN_WORDS if ' ' in word}
+
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
+# Variable-like names for keyword extraction (camelCase, snake_case, UPPER_CASE)
+_KEYWORD_VAR_RE = re.compile(
+    r'\b([A-Z][a-z]+[A-Z][a-zA-Z]*|[a-z]+_[a-z_]+|[A-Z][A-Z_]+)\b'
+)
+
+# Patterns for numbers with units
+_QUANTITY_RES = [
+    re.compile(
+        r'([±]?\d+\.?\d*)\s*(feet|ft|meters|m|seconds|s|ms|Hz|degrees|deg|percent|%|VDC|°C|rpm|mA)',
+        re.IGNORECASE
+    ),
+    re.compile(
+        r'(within|maximum|minimum|at least|no more than|exceeds|below|above)\s+([±]?\d+\.?\d*)',
+        re.IGNORECASE
+    ),
+    re.compile(
+        r'(\d+\.?\d*)\s*(?:to|–|-)\s*(\d+\.?\d*)\s*(feet|ft|meters|m|seconds|s|ms|Hz|degrees|deg|percent|%|VDC|°C|rpm|mA)?',
+        re.IGNORECASE
+    ),
+]
+
+# The four variable-name shapes fused into one alternation, so one scan
+# over the text replaces four
+_VARIABLE_NAME_RE = re.compile(
+    r'\b('
+    r'[a-z][a-z0-9]*(?:_[a-z0-9]+)+'        # snake_case
+    r'|[a-z][a-zA-Z0-9]*[A-Z][a-zA-Z0-9]*'  # camelCase
+    r'|[A-Z][a-z]+(?:[A-Z][a-z]+)+'         # PascalCase
+    r'|[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)*'       # UPPER_CASE
+    r')\b'
+)
+
 
 def tokenize(text: str) -> List[str]:
     """Tokenize text into words."""
     # Convert to lowercase and split
-    tokens = re.findall(r'\b\w+\b', text.lower())
-    return tokens
+    return _TOKEN_RE.findall(text.lower())
 
 
 def extract_keywords(text: str) -> List[str]:
     """Extract domain keywords from text."""
-    tokens = tokenize(text)
     keywords = []
-    
-    # Remove stopwords
-    tokens = [t for t in tokens if t not in STOPWORDS and len(t) > 2]
-    
-    # Match against domain dictionary
-    all_domain_words = set()
-    for category in DOMAIN_KEYWORDS.values():
-        all_domain_words.update(category)
-    
-    for token in tokens:
-        if token in all_domain_words:
+
+    # Remove stopwords, match against domain dictionary
+    for token in tokenize(text):
+        if token not in STOPWORDS and len(token) > 2 and token in _ALL_DOMAIN_WORDS:
             keywords.append(token)
-    
+
     # Extract variable-like names (camelCase, snake_case, UPPER_CASE)
-    var_pattern = r'\b([A-Z][a-z]+[A-Z][a-zA-Z]*|[a-z]+_[a-z_]+|[A-Z][A-Z_]+)\b'
-    var_matches = re.findall(var_pattern, text)
-    keywords.extend([v.lower() for v in var_matches])
-    
+    keywords.extend(v.lower() for v in _KEYWORD_VAR_RE.findall(text))
+
     # Extract noun phrases (simple pattern)
-    words = text.split()
-    for i in range(len(words) - 1):
-        bigram = f"{words[i]} {words[i+1]}".lower()
-        if bigram in [kw for cat in DOMAIN_KEYWORDS.values() for kw in cat]:
-            keywords.append(bigram)
-    
+    if _DOMAIN_PHRASES:
+        words = text.split()
+        for i in range(len(words) - 1):
+            bigram = f"{words[i]} {words[i+1]}".lower()
+            if bigram in _DOMAIN_PHRASES:
+                keywords.append(bigram)
+
     return list(set(keywords))
 
 
 def extract_quantities(text: str) -> List[Dict[str, any]]:
     """Extract numerical quantities with units."""
     quantities = []
-    
-    # Pattern for numbers with units
-    patterns = [
-        r'([±]?\d+\.?\d*)\s*(feet|ft|meters|m|seconds|s|ms|Hz|degrees|deg|percent|%|VDC|°C|rpm|mA)',
-        r'(within|maximum|minimum|at least|no more than|exceeds|below|above)\s+([±]?\d+\.?\d*)',
-        r'(\d+\.?\d*)\s*(?:to|–|-)\s*(\d+\.?\d*)\s*(feet|ft|meters|m|seconds|s|ms|Hz|degrees|deg|percent|%|VDC|°C|rpm|mA)?',
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
+
+    for pattern in _QUANTITY_RES:
+        for match in pattern.finditer(text):
             groups = match.groups()
             if len(groups) >= 2:
                 try:
@@ -100,26 +121,15 @@ def extract_quantities(text: str) -> List[Dict[str, any]]:
                     })
                 except (ValueError, IndexError):
                     continue
-    
+
     return quantities
 
 
 def extract_variable_names(text: str) -> Set[str]:
     """Extract variable names from text."""
-    # Pattern for variable names: snake_case, camelCase, PascalCase
-    patterns = [
-        r'\b([a-z][a-z0-9]*(?:_[a-z0-9]+)+)\b',  # snake_case
-        r'\b([a-z][a-zA-Z0-9]*[A-Z][a-zA-Z0-9]*)\b',  # camelCase
-        r'\b([A-Z][a-z]+(?:[A-Z][a-z]+)+)\b',  # PascalCase
-        r'\b([A-Z][A-Z0-9]*(?:_[A-Z0-9]+)*)\b',  # UPPER_CASE
-    ]
-    
-    variables = set()
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        variables.update(matches)
-    
-    return variables
+    # Single fused scan over the text; the alternation covers snake_case,
+    # camelCase, PascalCase and UPPER_CASE
+    return set(_VARIABLE_NAME_RE.findall(text))
 
 
 def normalize_whitespace(text: str) -> str: